@@ -46,8 +46,9 @@ system_state = {
     'tempo': 120,
     'key': 0,
     'performance_metrics': {
-        'latency': 0,
+        'scheduler_lag_ms': 0,
         'cpu_usage': 0,
+        'late_wakeups': 0,
         'active_agents': 0
     }
 }
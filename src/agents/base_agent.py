@@ -44,6 +44,7 @@ class BaseMusicalAgent(ConversableAgent):
         # Performance state
         self.active_notes = {}
         self.agent_id = f"{name}_{id(self)}"
+        self._reader_slot = event_buffer.register_reader(self.agent_id)
         
         # Musical state
         self.current_scale = self.determine_scale()
@@ -94,7 +95,7 @@ class BaseMusicalAgent(ConversableAgent):
         """Main loop: listen to other agents and respond musically"""
         while True:
             # Check for new events from other agents
-            event = self.event_buffer.read(self.agent_id)
+            event = self.event_buffer.read(self._reader_slot)
             
             if event and event['agent_id'] != self.agent_id:
                 # Process musical event from another agent
@@ -81,17 +81,16 @@ class MusicalEnsembleManager:
         """Start the musical performance"""
         logger.info("🎵 Starting Musical Performance")
         
-        # Start tempo keeper
-        asyncio.create_task(self.keep_tempo())
-        
-        # Start all agents
-        tasks = []
-        for agent in self.agents:
-            task = asyncio.create_task(agent.listen_and_respond())
-            tasks.append(task)
-        
-        # Run forever
-        await asyncio.gather(*tasks)
+        # Run forever: tempo keeper and agents share one task group,
+        # so cancelling the performance cancels all of them
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self.keep_tempo())
+            for agent in self.agents:
+                tg.create_task(agent.listen_and_respond())
+    
+    def stop(self):
+        """Release the shared musical context (call once the performance has ended)"""
+        self.shared_context.cleanup()
     
     async def keep_tempo(self):
         """Maintain global tempo and beat counter"""
@@ -6,6 +6,7 @@ import asyncio
 from typing import Callable, Optional, List, Dict
 import logging
 from ..analysis import RealtimeAudioAnalyzer, ChordDetector, OptimizedRingBuffer
+from ..memory.spsc_ring import SPSCRing
 
 
 class AudioInputController:
@@ -14,6 +15,8 @@ class AudioInputController:
     Handles real-time analysis and routing to agents
     """
     
+    FRAME_RING_SIZE = 64  # Mono blocks queued between the audio thread and analysis
+    
     def __init__(self, device_name: str = "Quantum 2626", 
                  sample_rate: int = 48000,
                  block_size: int = 64,
@@ -38,9 +41,16 @@ class AudioInputController:
         self.chord_detector = ChordDetector()
         self.input_buffer = OptimizedRingBuffer(size=4096, channels=channels)
         
+        # Audio thread -> event loop handoff: the PortAudio callback only fills
+        # a pre-allocated slot; analysis and agent callbacks run on the loop
+        self.frame_ring = SPSCRing(self.FRAME_RING_SIZE, (block_size,), np.float32)
+        self._frames_ready = None
+        self._drain_task = None
+        
         # State
         self.is_listening = False
         self.stream = None
+        self._loop = None  # Event loop captured at listen-start
         
         # Callbacks
         self.analysis_callbacks: List[Callable] = []
@@ -100,13 +110,22 @@ class AudioInputController:
         """Register callback for analysis results"""
         self.analysis_callbacks.append(callback)
     
+    def unregister_analysis_callback(self, callback: Callable):
+        """Remove a callback added with register_analysis_callback"""
+        # New list rather than remove(): _analyze_audio may be iterating the old one
+        self.analysis_callbacks = [cb for cb in self.analysis_callbacks if cb is not callback]
+    
     async def start_listening(self):
         """Start listening to audio input"""
         if self.is_listening:
             return
         
+        self._loop = asyncio.get_running_loop()
+        self._frames_ready = asyncio.Event()
+        ring = self.frame_ring
+        
         try:
-            # Audio callback function
+            # Audio callback function (PortAudio thread - no asyncio calls except the wakeup)
             def audio_callback(indata, frames, time, status):
                 if status:
                     self.logger.warning(f"Audio input status: {status}")
@@ -115,8 +134,17 @@ class AudioInputController:
                 if not self.input_buffer.write(indata.T):  # Transpose for channels x samples
                     self.logger.warning("Input buffer overflow")
                 
-                # Trigger async analysis
-                asyncio.create_task(self._analyze_audio(indata))
+                # Hand a mono copy to the analysis task
+                slot = ring.claim()
+                if slot is None or frames != len(slot):
+                    return  # Analysis is behind (or odd-sized block); drop this frame
+                if indata.shape[1] > 1:
+                    np.mean(indata, axis=1, out=slot)
+                else:
+                    slot[:] = indata[:, 0]
+                # Wake the loop only when the ring goes from empty to non-empty
+                if ring.publish():
+                    self._loop.call_soon_threadsafe(self._frames_ready.set)
             
             # Start audio stream
             self.stream = sd.InputStream(
@@ -127,6 +155,7 @@ class AudioInputController:
                 dtype='float32'
             )
             
+            self._drain_task = asyncio.create_task(self._drain_frames())
             self.stream.start()
             self.is_listening = True
             self.logger.info("Started audio input listening")
@@ -146,6 +175,13 @@ class AudioInputController:
                 self.stream.close()
                 self.stream = None
             
+            if self._drain_task:
+                self._drain_task.cancel()
+                self._drain_task = None
+            
+            # The cancelled drain may have left frames unreleased; a stale frame
+            # would keep the next start's first publish from waking the loop
+            self.frame_ring.reset()
             self.is_listening = False
             self.input_buffer.clear()
             self.logger.info("Stopped audio input listening")
@@ -153,20 +189,28 @@ class AudioInputController:
         except Exception as e:
             self.logger.error(f"Error stopping audio input: {e}")
     
-    async def _analyze_audio(self, audio_data: np.ndarray):
+    async def _drain_frames(self):
+        """Analyze frames queued by the audio thread, oldest first"""
+        ring = self.frame_ring
+        while True:
+            await self._frames_ready.wait()
+            self._frames_ready.clear()
+            
+            # Slots stay reserved until advance(), so analysis reads them in place
+            frame = ring.peek()
+            while frame is not None:
+                await self._analyze_audio(frame)
+                ring.advance()
+                frame = ring.peek()
+    
+    async def _analyze_audio(self, mono_data: np.ndarray):
         """
         Analyze audio frame asynchronously
         
         Args:
-            audio_data: Input audio frame
+            mono_data: Mono input frame
         """
         try:
-            # Use first channel for analysis if stereo
-            if audio_data.shape[1] > 1:
-                mono_data = np.mean(audio_data, axis=1)
-            else:
-                mono_data = audio_data[:, 0]
-            
             # Run analysis
             analysis = await self.analyzer.analyze_frame(mono_data)
             
@@ -200,7 +244,7 @@ class AudioInputController:
                     await callback(analysis)
                 else:
                     # Run sync callbacks in executor to not block
-                    await asyncio.get_event_loop().run_in_executor(
+                    await self._loop.run_in_executor(
                         None, callback, analysis
                     )
             
@@ -260,12 +304,12 @@ class AudioInputController:
         self.logger.info(f"Starting input calibration for {duration} seconds...")
         
         levels = []
-        start_time = asyncio.get_event_loop().time()
         
         # Temporary listening
         await self.start_listening()
+        start_time = self._loop.time()
         
-        while asyncio.get_event_loop().time() - start_time < duration:
+        while self._loop.time() - start_time < duration:
             levels.append(self.get_input_level())
             await asyncio.sleep(0.1)
         
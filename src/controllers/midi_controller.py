@@ -118,7 +118,14 @@ class MidiPedalController:
             callback: Function to call when event occurs
         """
         if event_type in self.callbacks:
-            self.callbacks[event_type].append(callback)
+            # Classify once here so dispatch can always await
+            if asyncio.iscoroutinefunction(callback):
+                wrapper = callback
+            else:
+                async def wrapper(*args, _cb=callback):
+                    _cb(*args)
+            
+            self.callbacks[event_type].append(wrapper)
             self.logger.debug(f"Registered callback for {event_type}")
     
     async def listen(self):
@@ -260,11 +267,8 @@ class MidiPedalController:
                     await self._call_async(callback, bpm)
     
     async def _call_async(self, callback: Callable, *args):
-        """Helper to call either sync or async callbacks"""
-        if asyncio.iscoroutinefunction(callback):
-            await callback(*args)
-        else:
-            callback(*args)
+        """Helper to call a registered callback (wrapped as async at registration)"""
+        await callback(*args)
     
     def get_status(self) -> Dict:
         """Get current controller status"""
@@ -4,12 +4,18 @@ Manages separate processes with appropriate priorities
 """
 
 import multiprocessing as mp
+from multiprocessing import reduction
 import asyncio
+import ctypes
+import ctypes.util
 import os
 import sys
 import signal
 import logging
+import selectors
+import struct
 import time
+import numpy as np
 from typing import Optional, Dict, Any
 from pathlib import Path
 
@@ -24,11 +30,30 @@ except ImportError:
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.memory.shared_buffer import AudioEventBuffer, EventType
-from src.engine.supercollider import SuperColliderEngine
+from src.memory.shared_buffer import AudioEventBuffer, EventType, EVENT_DTYPE
+from src.memory import ring_reader
+from src.engine.supercollider import SuperColliderEngine, MIDI_HZ, open_osc_socket
 
 logger = logging.getLogger(__name__)
 
+LOG_FORMAT = '%(asctime)s - %(processName)s - %(levelname)s - %(message)s'
+
+
+def configure_logging():
+    """
+    Log INFO and above in the manager's format.
+    
+    forkserver children start from a fresh interpreter and inherit none of the
+    parent's logging setup, so each process calls this itself. No-op once the
+    root logger has handlers.
+    """
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+# Children are forked from a slim forkserver instead of this (large) process.
+# Keep heavy imports inside main_loop and the __main__ guard below intact.
+START_METHOD = 'forkserver' if 'forkserver' in mp.get_all_start_methods() else 'spawn'
+mp_context = mp.get_context(START_METHOD)
+
 class ProcessPriority:
     """Platform-independent process priority settings"""
     REALTIME = -20  # Highest priority (Unix nice value)
@@ -36,19 +61,128 @@ class ProcessPriority:
     NORMAL = 0
     LOW = 10
     IDLE = 19  # Lowest priority
+    RT_FIFO_PRIO = 80  # SCHED_FIFO priority used for REALTIME on Linux
+
+CPU_SYSFS = Path("/sys/devices/system/cpu")
+
+def _read_cpu_list(path: Path) -> list:
+    """Parse a sysfs cpulist such as '2-5,8' into [2, 3, 4, 5, 8]"""
+    try:
+        text = path.read_text().strip()
+    except OSError:
+        return []
+    
+    cpus = []
+    for part in text.split(','):
+        if not part:
+            continue
+        if '-' in part:
+            lo, hi = part.split('-')
+            cpus.extend(range(int(lo), int(hi) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+def _detect_isolated() -> list:
+    """CPUs reserved with isolcpus= (empty if none or not Linux)"""
+    return _read_cpu_list(CPU_SYSFS / "isolated")
+
+def _one_thread_per_core(cpus: list) -> list:
+    """Drop SMT siblings so no two processes share a physical core"""
+    chosen = []
+    taken = set()
+    for cpu in cpus:
+        if cpu in taken:
+            continue
+        siblings = _read_cpu_list(CPU_SYSFS / f"cpu{cpu}" / "topology" / "thread_siblings_list")
+        taken.update(siblings or [cpu])
+        chosen.append(cpu)
+    return chosen
+
+def plan_cpu_affinity() -> Dict[str, list]:
+    """
+    Assign cores to processes, isolated cores first.
+    
+    Audio gets the first half of the isolated cores, control the next
+    quarter and the GUI the rest; any group left empty falls back to the
+    non-isolated cores.
+    """
+    online = _read_cpu_list(CPU_SYSFS / "online")
+    if not online:
+        count = psutil.cpu_count() if HAS_PSUTIL else os.cpu_count()
+        online = list(range(count or 1))
+    
+    isolated = _one_thread_per_core([c for c in _detect_isolated() if c in online])
+    shared = _one_thread_per_core([c for c in online if c not in isolated])
+    pool = isolated or shared
+    
+    n_audio = max(1, len(pool) // 2)
+    n_control = max(1, len(pool) // 4)
+    audio = pool[:n_audio]
+    control = pool[n_audio:n_audio + n_control] or shared or audio
+    gui = pool[n_audio + n_control:] or shared or control
+    
+    return {'audio': audio, 'control': control, 'gui': gui}
+
+class ProcessStats(ctypes.Structure):
+    """Per-process counters in shared memory (no manager round-trips)"""
+    _fields_ = [
+        ('events_processed', ctypes.c_uint64),
+        ('events_dropped', ctypes.c_uint64),
+        ('last_latency_ns', ctypes.c_uint64),
+    ]
 
-class PerformiaProcess(mp.Process):
+class PerformiaProcess(mp_context.Process):
     """Base class for Performia system processes"""
     
-    def __init__(self, name: str, priority: int = ProcessPriority.NORMAL):
+    # Raw descriptors are not inherited under forkserver/spawn; dup them across
+    _FD_ATTRS = ('notify_fd', '_quit_r', '_quit_w')
+    
+    def __init__(self, name: str, priority: int = ProcessPriority.NORMAL,
+                 notify_fd: Optional[int] = None, cpus: Optional[list] = None):
         super().__init__(name=name)
         self.priority = priority
+        self.notify_fd = notify_fd
+        self.cpus = cpus
         self.shared_buffer = None
-        self.running = mp.Event()
-        self.stats = mp.Manager().dict()
+        self.stats = mp_context.RawValue(ProcessStats)
+        
+        # Quit pipe: readable once the manager asks us to stop, so shutdown
+        # shares the same select() wait point as the event notifications
+        self._quit_r, self._quit_w = os.pipe()
+        os.set_blocking(self._quit_r, False)
+    
+    def __getstate__(self):
+        """Send file descriptors to the child alongside the pickled process"""
+        state = self.__dict__.copy()
+        for attr in self._FD_ATTRS:
+            if state.get(attr) is not None:
+                state[attr] = reduction.DupFd(state[attr])
+        return state
+    
+    def __setstate__(self, state):
+        """Receive file descriptors in the child"""
+        for attr in self._FD_ATTRS:
+            if state.get(attr) is not None:
+                state[attr] = state[attr].detach()
+        self.__dict__.update(state)
         
     def setup_priority(self):
         """Set process priority based on platform"""
+        # Real-time scheduling: run until we block instead of being time-sliced by CFS
+        if self.priority == ProcessPriority.REALTIME and hasattr(os, 'sched_setscheduler'):
+            try:
+                os.sched_setscheduler(
+                    0, os.SCHED_FIFO, os.sched_param(ProcessPriority.RT_FIFO_PRIO)
+                )
+                logger.info(f"{self.name}: Using SCHED_FIFO priority {ProcessPriority.RT_FIFO_PRIO}")
+                return
+            except PermissionError:
+                logger.warning(
+                    f"{self.name}: SCHED_FIFO not permitted - "
+                    "set rtprio via `ulimit -r` or CAP_SYS_NICE; falling back to nice"
+                )
+        
         if not HAS_PSUTIL:
             return
             
@@ -90,12 +224,14 @@ class PerformiaProcess(mp.Process):
     
     def run(self):
         """Process main loop - override in subclasses"""
+        configure_logging()
         self.setup_priority()
-        self.running.set()
         
         try:
             # Connect to shared memory
-            self.shared_buffer = AudioEventBuffer("PerformiaBuffer", create=False)
+            self.shared_buffer = AudioEventBuffer(
+                "PerformiaBuffer", create=False, notify_fd=self.notify_fd
+            )
             logger.info(f"{self.name}: Connected to shared buffer")
             
             # Run main loop
@@ -110,23 +246,116 @@ class PerformiaProcess(mp.Process):
         """Override this in subclasses"""
         pass
     
+    def make_selector(self) -> selectors.BaseSelector:
+        """Create a selector with the quit pipe registered (data='quit')"""
+        selector = selectors.DefaultSelector()
+        selector.register(self._quit_r, selectors.EVENT_READ, data='quit')
+        return selector
+    
+    def request_stop(self):
+        """Ask the process to leave its main loop (called from the manager)"""
+        try:
+            os.write(self._quit_w, b'x')
+        except OSError:
+            pass  # Pipe already closed or full - a stop is pending either way
+    
+    def close_quit_pipe(self):
+        """Release the quit pipe once the process has exited"""
+        for fd in (self._quit_r, self._quit_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+    
     def cleanup(self):
         """Clean up resources"""
         if self.shared_buffer:
             self.shared_buffer.close()
-        self.running.clear()
+
+OSC_BUNDLE_HEADER = b"#bundle\0" + struct.pack(">Q", 1)  # Timetag 1 = immediately
+
+
+def build_s_new_template(synth: str = "sine"):
+    """
+    Encode a reference /s_new message and locate its float arguments.
+    
+    Only freq and amp change between notes, so callers can patch them
+    in place with struct.pack_into instead of re-encoding the message.
+    
+    Returns:
+        Tuple of (encoded message, freq offset, amp offset)
+    """
+    from pythonosc import osc_message_builder
+    
+    # Sentinels are exactly representable and never appear elsewhere
+    freq_sentinel, amp_sentinel = 12345.5, -6789.25
+    
+    msg = osc_message_builder.OscMessageBuilder(address="/s_new")
+    msg.add_arg(synth)
+    msg.add_arg(-1, 'i')  # Node ID assigned by the server
+    msg.add_arg(1, 'i')   # Add action: tail
+    msg.add_arg(0, 'i')   # Target group
+    msg.add_arg("freq")
+    msg.add_arg(freq_sentinel, 'f')
+    msg.add_arg("amp")
+    msg.add_arg(amp_sentinel, 'f')
+    dgram = msg.build().dgram
+    
+    freq_offset = dgram.index(struct.pack(">f", freq_sentinel))
+    amp_offset = dgram.index(struct.pack(">f", amp_sentinel))
+    return dgram, freq_offset, amp_offset
 
 class AudioProcess(PerformiaProcess):
     """Audio synthesis process - highest priority"""
     
-    def __init__(self):
-        super().__init__("AudioProcess", ProcessPriority.REALTIME)
+    BATCH_SIZE = 64  # Max events drained (and notes bundled) per pass
+    
+    def __init__(self, notify_fd: Optional[int] = None, cpus: Optional[list] = None):
+        super().__init__("AudioProcess", ProcessPriority.REALTIME, notify_fd, cpus)
         self.sc_engine = None
+        self._osc_template, self._freq_offset, self._amp_offset = build_s_new_template()
+    
+    def _build_bundle_buffer(self) -> bytearray:
+        """Preallocate an OSC bundle holding BATCH_SIZE copies of the /s_new template"""
+        tmpl = self._osc_template
+        slot = 4 + len(tmpl)
+        packet = bytearray(len(OSC_BUNDLE_HEADER) + self.BATCH_SIZE * slot)
+        packet[:len(OSC_BUNDLE_HEADER)] = OSC_BUNDLE_HEADER
+        
+        for k in range(self.BATCH_SIZE):
+            base = len(OSC_BUNDLE_HEADER) + k * slot
+            struct.pack_into(">i", packet, base, len(tmpl))
+            packet[base + 4:base + slot] = tmpl
+        
+        return packet
+    
+    def run(self):
+        """Lock memory before entering the real-time loop"""
+        configure_logging()
+        self.lock_memory()
+        super().run()
+    
+    def lock_memory(self):
+        """Prevent page faults on audio pages (mlockall, Linux only)"""
+        if not sys.platform.startswith('linux'):
+            return
+        
+        MCL_CURRENT, MCL_FUTURE = 1, 2
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            if libc.mlockall(MCL_CURRENT | MCL_FUTURE) != 0:
+                errno = ctypes.get_errno()
+                logger.warning(f"{self.name}: mlockall failed: {os.strerror(errno)}")
+            else:
+                logger.info(f"{self.name}: Locked process memory")
+        except OSError as e:
+            logger.warning(f"Could not lock memory: {e}")
         
     def main_loop(self):
         """Audio process main loop"""
-        # Pin to first 4 CPU cores for audio processing
-        self.setup_cpu_affinity([0, 1, 2, 3])
+        # Pin to the cores assigned by the manager (isolated first)
+        if self.cpus:
+            self.setup_cpu_affinity(self.cpus)
         
         # Start SuperCollider engine
         logger.info("Starting SuperCollider engine...")
@@ -134,13 +363,16 @@ class AudioProcess(PerformiaProcess):
         # Connect to already-running Supernova server
         logger.info("Connecting to Supernova server on port 57110...")
         
-        # Initialize OSC client for SuperCollider communication
-        from pythonosc import udp_client
-        self.osc_client = udp_client.SimpleUDPClient("127.0.0.1", 57110)
+        # Pre-connected UDP socket: each send() skips the address lookup.
+        # Same options as SuperColliderEngine's socket (small SNDBUF, no PMTU probing)
+        from pythonosc import osc_message_builder
+        self.osc_sock = open_osc_socket()
         
         # Send test message
         try:
-            self.osc_client.send_message("/status", 1)
+            msg = osc_message_builder.OscMessageBuilder(address="/status")
+            msg.add_arg(1)
+            self.osc_sock.send(msg.build().dgram)
             logger.info("✓ Connected to Supernova")
         except Exception as e:
             logger.warning(f"Could not connect to Supernova: {e}")
@@ -148,31 +380,74 @@ class AudioProcess(PerformiaProcess):
         # Monitor shared memory for events
         reader_id = 0  # Audio process uses reader 0
         
-        while self.running.is_set():
-            events = self.shared_buffer.read_events(reader_id, max_events=50)
+        # Preallocated batch; compile the ring reader before the loop starts
+        batch = np.empty(self.BATCH_SIZE, dtype=EVENT_DTYPE)
+        ring_reader.warm_up()
+        
+        # Prebuilt bundle: per note only freq and amp are patched in place
+        packet = self._build_bundle_buffer()
+        packet_view = memoryview(packet)
+        slot = 4 + len(self._osc_template)
+        freq_offset = len(OSC_BUNDLE_HEADER) + 4 + self._freq_offset
+        amp_offset = len(OSC_BUNDLE_HEADER) + 4 + self._amp_offset
+        
+        # Block on the buffer's eventfd and the quit pipe instead of polling
+        selector = self.make_selector()
+        notify_fd = self.shared_buffer.get_notify_fd()
+        if notify_fd is not None:
+            selector.register(notify_fd, selectors.EVENT_READ, data='notify')
+            timeout = None
+        else:
+            timeout = 0.001  # 1ms polling fallback
+        
+        running = True
+        while running:
+            for key, _ in selector.select(timeout=timeout):
+                if key.data == 'quit':
+                    running = False
+                else:
+                    self.shared_buffer.clear_notify()
+            if not running:
+                break
             
-            for event in events:
-                timestamp, agent_id, event_type, pitch, velocity, duration, flags = event
+            # Drain everything published since the last wakeup
+            while True:
+                n = self.shared_buffer.drain_into(reader_id, batch)
+                if not n:
+                    break
+                events = batch[:n]
+                
+                self.stats.events_processed += len(events)
+                self.stats.last_latency_ns = max(0, time.time_ns() - int(events['timestamp'][-1]))
+                
+                # Filter and convert the whole batch at once
+                notes = events[events['event_type'] == EventType.NOTE_ON]
+                if not len(notes):
+                    continue
+                
+                pitches = np.clip(np.rint(notes['pitch']), 0, 127).astype(np.intp)
+                freqs = MIDI_HZ[pitches]
+                
+                # One OSC bundle (one datagram) per batch of events
+                for k, (freq, velocity) in enumerate(zip(freqs.tolist(), notes['velocity'].tolist())):
+                    struct.pack_into(">f", packet, freq_offset + k * slot, freq)
+                    struct.pack_into(">f", packet, amp_offset + k * slot, velocity)
                 
-                # Process musical events
-                if event_type == EventType.NOTE_ON:
-                    # Send to SuperCollider
-                    logger.debug(f"Playing note: pitch={pitch}, vel={velocity}")
-                    try:
-                        # Create synth in SuperCollider
-                        self.osc_client.send_message("/s_new", [
-                            "sine", -1, 1, 0,
-                            "freq", pitch * 8.175799,
-                            "amp", velocity
-                        ])
-                    except:
-                        pass
+                logger.debug(f"Playing {len(notes)} notes")
                 
-            # Sleep briefly to avoid busy waiting
-            time.sleep(0.001)  # 1ms polling rate
+                # Send to SuperCollider
+                try:
+                    self.osc_sock.send(packet_view[:len(OSC_BUNDLE_HEADER) + len(notes) * slot])
+                except OSError:
+                    pass  # Server not listening (ICMP refused)
+        
+        selector.close()
+        packet_view.release()
     
     def cleanup(self):
         """Clean up audio resources"""
+        if hasattr(self, 'osc_sock'):
+            self.osc_sock.close()
         if hasattr(self, 'sc_process'):
             self.sc_process.terminate()
             self.sc_process.wait()
@@ -181,14 +456,16 @@ class AudioProcess(PerformiaProcess):
 class ControlProcess(PerformiaProcess):
     """Agent control and AI process - normal priority"""
     
-    def __init__(self):
-        super().__init__("ControlProcess", ProcessPriority.NORMAL)
+    def __init__(self, notify_fd: Optional[int] = None, cpus: Optional[list] = None):
+        super().__init__("ControlProcess", ProcessPriority.NORMAL, notify_fd, cpus)
         self.agents = []
+        self._next_fire = []  # Next trigger time per agent (monotonic)
         
     def main_loop(self):
         """Control process main loop"""
-        # Pin to CPU cores 4-5
-        self.setup_cpu_affinity([4, 5])
+        # Pin to the cores assigned by the manager
+        if self.cpus:
+            self.setup_cpu_affinity(self.cpus)
         
         # Initialize agents
         from src.main_simple import SimpleMusicalAgent
@@ -199,41 +476,87 @@ class ControlProcess(PerformiaProcess):
             self.agents.append(agent)
         
         logger.info(f"Initialized {len(self.agents)} agents")
+        self._next_fire = [0.0] * len(self.agents)
         
         # Agent decision loop
         decision_rate = 20  # Hz
         interval = 1.0 / decision_rate
+        pattern_period = 0.5  # Seconds between triggers per agent
+        
+        # Sleeping on the quit pipe makes shutdown immediate
+        selector = self.make_selector()
         
-        while self.running.is_set():
-            start_time = time.perf_counter()
+        while True:
+            start_time = time.monotonic()
+            
+            # Reserve room for this tick up front; notes that don't fit are
+            # dropped now rather than played late once the reader catches up
+            free = self.shared_buffer.free_slots()
+            dropped = 0
+            tick_ns = time.time_ns()  # One clock read stamps every event this tick
             
             # Each agent makes decisions
+            written = False
             for i, agent in enumerate(self.agents):
-                # Simple pattern generation
-                if time.time() % 0.5 < 0.1:  # Trigger events periodically
-                    self.shared_buffer.write_event(
+                # Simple pattern generation - fire once per period, never on consecutive ticks
+                if start_time >= self._next_fire[i]:
+                    self._next_fire[i] = start_time + pattern_period
+                    if free > 0 and self.shared_buffer.write_event(
                         agent_id=i,
                         event_type=EventType.NOTE_ON,
                         pitch=60 + (i * 7),  # Different pitch per agent
                         velocity=0.7,
-                        duration=200
-                    )
+                        duration=200,
+                        timestamp=tick_ns
+                    ):
+                        free -= 1
+                        self.stats.events_processed += 1
+                        written = True
+                    else:
+                        dropped += 1
+            
+            if dropped:
+                self.stats.events_dropped += dropped
+                logger.warning(f"Buffer full, dropped {dropped} events")
+            
+            # Wake the audio process once per batch
+            if written:
+                self.shared_buffer.notify()
             
             # Maintain decision rate
-            elapsed = time.perf_counter() - start_time
-            if elapsed < interval:
-                time.sleep(interval - elapsed)
+            elapsed = time.monotonic() - start_time
+            if selector.select(timeout=max(0.0, interval - elapsed)):
+                break
+        
+        selector.close()
 
 class GUIProcess(PerformiaProcess):
     """Web GUI process - low priority, read-only access"""
     
-    def __init__(self):
-        super().__init__("GUIProcess", ProcessPriority.LOW)
+    def __init__(self, cpus: Optional[list] = None):
+        super().__init__("GUIProcess", ProcessPriority.LOW, cpus=cpus)
         
     def main_loop(self):
         """GUI process main loop"""
-        # Pin to CPU cores 6-7
-        self.setup_cpu_affinity([6, 7])
+        # Pin to the cores assigned by the manager
+        if self.cpus:
+            self.setup_cpu_affinity(self.cpus)
+        
+        # SCHED_IDLE: the GUI only runs when nothing else wants the CPU
+        if hasattr(os, 'sched_setscheduler'):
+            try:
+                os.sched_setscheduler(0, os.SCHED_IDLE, os.sched_param(0))
+                logger.info(f"{self.name}: Using SCHED_IDLE")
+            except OSError as e:
+                logger.warning(f"Could not set SCHED_IDLE: {e}")
+        
+        # Serve everything from one eventlet hub instead of a Werkzeug thread per request
+        os.environ['EVENTLET_NO_GREENDNS'] = 'yes'
+        try:
+            import eventlet
+            eventlet.monkey_patch()
+        except ImportError:
+            logger.warning("eventlet not installed - GUI falls back to threaded server")
         
         # Import Flask app
         os.environ['FLASK_ENV'] = 'production'
@@ -251,7 +574,7 @@ class GUIProcess(PerformiaProcess):
         # Start Flask app on port 5001
         try:
             from app import app, socketio
-            logger.info("Starting GUI on http://localhost:5001")
+            logger.info(f"Starting GUI on http://localhost:5001 ({socketio.async_mode})")
             socketio.run(app, host='0.0.0.0', port=5001, debug=False)
         except ImportError as e:
             logger.error(f"Could not import GUI: {e}")
@@ -269,6 +592,7 @@ class PerformiaProcessManager:
         self.control_process = None
         self.gui_process = None
         self.processes = []
+        self.cpu_plan = {}
         
     def start(self):
         """Start all system processes"""
@@ -281,22 +605,27 @@ class PerformiaProcessManager:
         self.shared_buffer = AudioEventBuffer("PerformiaBuffer", create=True)
         logger.info(f"✓ Shared memory created (1MB)")
         
+        # Assign cores (isolated cores go to audio first)
+        self.cpu_plan = plan_cpu_affinity()
+        logger.info(f"CPU plan: {self.cpu_plan}")
+        
         # Start audio process (highest priority)
         logger.info("Starting audio process...")
-        self.audio_process = AudioProcess()
+        notify_fd = self.shared_buffer.get_notify_fd()
+        self.audio_process = AudioProcess(notify_fd, self.cpu_plan['audio'])
         self.audio_process.start()
         self.processes.append(self.audio_process)
         time.sleep(1)  # Let audio initialize
         
         # Start control process (normal priority)
         logger.info("Starting control process...")
-        self.control_process = ControlProcess()
+        self.control_process = ControlProcess(notify_fd, self.cpu_plan['control'])
         self.control_process.start()
         self.processes.append(self.control_process)
         
         # Start GUI process (low priority)
         logger.info("Starting GUI process...")
-        self.gui_process = GUIProcess()
+        self.gui_process = GUIProcess(self.cpu_plan['gui'])
         self.gui_process.start()
         self.processes.append(self.gui_process)
         
@@ -310,17 +639,42 @@ class PerformiaProcessManager:
         # Monitor processes
         self.monitor()
     
+    def _watch_process(self, selector: selectors.BaseSelector, process):
+        """Register a child's exit with the selector (pidfd on Linux, else the mp sentinel)"""
+        fd = process.sentinel
+        if hasattr(os, 'pidfd_open'):
+            try:
+                fd = os.pidfd_open(process.pid)
+            except OSError:
+                pass  # Already reaped or kernel < 5.3
+        selector.register(fd, selectors.EVENT_READ, data=process)
+    
+    def _unwatch_process(self, selector: selectors.BaseSelector, key):
+        """Unregister a watched child and close its pidfd"""
+        selector.unregister(key.fileobj)
+        if key.fileobj != key.data.sentinel:
+            os.close(key.fileobj)
+    
     def monitor(self):
         """Monitor process health and performance"""
+        # Child exits wake us immediately; the timeout paces the buffer check
+        selector = selectors.DefaultSelector()
+        for process in self.processes:
+            self._watch_process(selector, process)
+        
         try:
             while True:
-                time.sleep(1)
+                events = selector.select(timeout=1.0)
+                
+                # Restart any process that exited
+                for key, _ in events:
+                    process = key.data
+                    self._unwatch_process(selector, key)
+                    logger.error(f"Process {process.name} died!")
+                    self._watch_process(selector, self.restart_process(process))
                 
-                # Check process health
-                for process in self.processes:
-                    if not process.is_alive():
-                        logger.error(f"Process {process.name} died!")
-                        self.restart_process(process)
+                if events:
+                    continue
                 
                 # Get buffer stats
                 stats = self.shared_buffer.get_buffer_stats()
@@ -330,20 +684,29 @@ class PerformiaProcessManager:
         except KeyboardInterrupt:
             logger.info("Shutdown requested...")
             self.stop()
+        finally:
+            for key in list(selector.get_map().values()):
+                self._unwatch_process(selector, key)
+            selector.close()
     
     def restart_process(self, process):
-        """Restart a failed process"""
+        """Restart a failed process and return its replacement"""
         logger.info(f"Restarting {process.name}...")
+        process.join(timeout=0)  # Reap the exited child
+        process.close_quit_pipe()
         
+        notify_fd = self.shared_buffer.get_notify_fd()
         if isinstance(process, AudioProcess):
-            self.audio_process = AudioProcess()
-            self.audio_process.start()
+            replacement = self.audio_process = AudioProcess(notify_fd, self.cpu_plan.get('audio'))
         elif isinstance(process, ControlProcess):
-            self.control_process = ControlProcess()
-            self.control_process.start()
-        elif isinstance(process, GUIProcess):
-            self.gui_process = GUIProcess()
-            self.gui_process.start()
+            replacement = self.control_process = ControlProcess(notify_fd, self.cpu_plan.get('control'))
+        else:
+            replacement = self.gui_process = GUIProcess(self.cpu_plan.get('gui'))
+        replacement.start()
+        
+        # Track the replacement so stop() and the monitor see it
+        self.processes[self.processes.index(process)] = replacement
+        return replacement
     
     def stop(self):
         """Stop all processes gracefully"""
@@ -352,7 +715,7 @@ class PerformiaProcessManager:
         # Signal processes to stop
         for process in self.processes:
             if process.is_alive():
-                process.running.clear()
+                process.request_stop()
         
         # Wait for processes to finish
         for process in self.processes:
@@ -360,6 +723,7 @@ class PerformiaProcessManager:
             if process.is_alive():
                 logger.warning(f"Force terminating {process.name}")
                 process.terminate()
+            process.close_quit_pipe()
         
         # Clean up shared memory
         if self.shared_buffer:
@@ -375,10 +739,7 @@ def signal_handler(signum, frame):
 def main():
     """Main entry point for process manager"""
     # Set up logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(processName)s - %(levelname)s - %(message)s'
-    )
+    configure_logging()
     
     # Register signal handlers
     signal.signal(signal.SIGINT, signal_handler)
@@ -7,15 +7,199 @@ import time
 import platform
 import logging
 import asyncio
+import heapq
+import socket
+import struct
+import numpy as np
 from typing import Dict, Optional, List
-from pythonosc import udp_client, osc_server, dispatcher
+from pythonosc import osc_message_builder
 import threading
 
 logger = logging.getLogger(__name__)
 
+# Equal-tempered frequency for every MIDI note (A4 = 69 = 440 Hz)
+MIDI_HZ = 440.0 * np.power(2.0, (np.arange(128, dtype=np.float32) - 69) / 12.0)
+
+SC_HOST = "127.0.0.1"
+SC_PORT = 57110
+OSC_SNDBUF = 4096  # Small send buffer: back-pressure instead of queueing behind a stalled server
+STATUS_TIMEOUT = 0.01  # Seconds to wait for /status.reply from a running server
+
+
+# Control names per SynthDef, in argument order (see define_*_synth)
+SYNTH_PARAMS = {
+    'sine': ('out', 'freq', 'amp', 'pan', 'gate'),
+    'kick': ('out', 'freq', 'amp', 'pan'),
+    'snare': ('out', 'freq', 'amp', 'pan'),
+    'hihat': ('out', 'amp', 'pan'),
+    'bass': ('out', 'freq', 'amp', 'pan', 'sustain'),
+    'lead': ('out', 'freq', 'amp', 'pan', 'sustain'),
+}
+
+
+def _osc_string_size(value: str) -> int:
+    """Encoded size of an OSC string (null-terminated, padded to 4 bytes)"""
+    return (len(value.encode()) // 4 + 1) * 4
+
+
+class SNewTemplate:
+    """Pre-encoded /s_new message for one synth and parameter set"""
+    
+    def __init__(self, synth_name: str, keys: tuple):
+        msg = osc_message_builder.OscMessageBuilder(address="/s_new")
+        msg.add_arg(synth_name)
+        msg.add_arg(0, 'i')  # Node ID, patched per note
+        msg.add_arg(1, 'i')  # Add action: tail
+        msg.add_arg(0, 'i')  # Target group
+        for key in keys:
+            msg.add_arg(key)
+            msg.add_arg(0.0, 'f')
+        self.buf = bytearray(msg.build().dgram)
+        
+        # Fixed-width tail: three ints, then (key, float) pairs
+        offset = len(self.buf) - sum(_osc_string_size(k) + 4 for k in keys)
+        self.node_offset = offset - 12
+        self.param_offsets = []
+        for key in keys:
+            offset += _osc_string_size(key)
+            self.param_offsets.append(offset)
+            offset += 4
+    
+    def encode(self, node_id: int, values) -> bytearray:
+        """Patch node ID and parameter values into the template buffer"""
+        buf = self.buf
+        struct.pack_into(">i", buf, self.node_offset, node_id)
+        for offset, value in zip(self.param_offsets, values):
+            struct.pack_into(">f", buf, offset, value)
+        return buf
+
+
+def open_osc_socket(host: str = SC_HOST, port: int = SC_PORT) -> socket.socket:
+    """
+    Open a connected UDP socket tuned for loopback OSC traffic.
+    
+    Args:
+        host: Server address
+        port: Server UDP port
+        
+    Returns:
+        Connected datagram socket
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, OSC_SNDBUF)
+    
+    # Skip path-MTU probing (Linux only)
+    if hasattr(socket, 'IP_MTU_DISCOVER'):
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MTU_DISCOVER, socket.IP_PMTUDISC_DONT)
+    
+    sock.connect((host, port))
+    return sock
+
+
+class FastOscReceiver:
+    """
+    Allocation-free receiver for the few server replies the engine consumes.
+    
+    Packets land in one reused buffer and are dispatched by address prefix;
+    handlers get (memoryview, nbytes) and parse the arguments they need.
+    """
+    
+    BUFFER_SIZE = 1500
+    
+    def __init__(self, host: str = SC_HOST, port: int = 0):
+        # Ephemeral port by default: 57120 belongs to sclang
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self._buf = bytearray(self.BUFFER_SIZE)
+        self._mv = memoryview(self._buf)
+        self._handlers = []  # (null-terminated address, handler)
+        self._running = False
+        self._thread = None
+    
+    def map(self, address: str, handler):
+        """Register handler(view, nbytes) for an OSC address"""
+        self._handlers.append((address.encode() + b"\0", handler))
+    
+    def sendto(self, dgram, address=(SC_HOST, SC_PORT)):
+        """Send from the receiving socket so the server replies here"""
+        self.sock.sendto(dgram, address)
+    
+    def start(self):
+        """Serve replies on a daemon thread"""
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="SCReplyReceiver", daemon=True)
+        self._thread.start()
+    
+    def _serve(self):
+        buf, mv = self._buf, self._mv
+        while self._running:
+            try:
+                n = self.sock.recv_into(mv)
+            except ConnectionRefusedError:
+                continue  # ICMP from an earlier send while the server was down
+            except OSError:
+                break
+            if not n:
+                continue  # Woken by shutdown() or an empty datagram
+            
+            for address, handler in self._handlers:
+                if buf.startswith(address):
+                    try:
+                        handler(mv, n)
+                    except Exception as e:
+                        logger.error(f"OSC reply handler error: {e}")
+                    break
+    
+    def close(self):
+        """Stop the receive thread and close the socket"""
+        self._running = False
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)  # Wakes a blocked recv_into
+        except OSError:
+            pass
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.sock.close()
+
+
+class OscSender:
+    """SimpleUDPClient-compatible sender over a pre-connected socket"""
+    
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+    
+    def send_message(self, address: str, value=None):
+        """Encode and send one OSC message (value may be a scalar or a list)"""
+        builder = osc_message_builder.OscMessageBuilder(address=address)
+        if value is None:
+            values = []
+        elif isinstance(value, (list, tuple)):
+            values = value
+        else:
+            values = [value]
+        for val in values:
+            builder.add_arg(val)
+        self.send(builder.build().dgram)
+    
+    def send(self, dgram):
+        """Send pre-encoded OSC bytes"""
+        try:
+            self.sock.send(dgram)
+        except ConnectionRefusedError:
+            logger.debug("OSC send refused - server not listening")
+
 class SuperColliderEngine:
     """Manages SuperCollider server and synthesis"""
     
+    _shared_osc_client: Optional[OscSender] = None
+    
+    @classmethod
+    def shared_osc_client(cls) -> OscSender:
+        """OSC sender shared by every engine in this process"""
+        if cls._shared_osc_client is None:
+            cls._shared_osc_client = OscSender(open_osc_socket())
+        return cls._shared_osc_client
+    
     def __init__(self, server_options: dict = None):
         self.server_options = server_options or {
             'blockSize': 64,
@@ -27,12 +211,24 @@ class SuperColliderEngine:
             'verbosity': 0
         }
         
-        # OSC client for sending to SuperCollider
-        self.osc_client = udp_client.SimpleUDPClient("127.0.0.1", 57110)
+        # OSC client for sending to SuperCollider (one socket per process)
+        self.osc_client = self.shared_osc_client()
         self.server_process = None
         self.is_running = False
         self.synth_nodes = {}
         self.next_node_id = 1000
+        self._s_new_templates = {}  # (synth, param keys) -> SNewTemplate
+        
+        # Reply channel for /status.reply and /n_end (created on first start, then reused)
+        self._receiver = None
+        self._status_event = threading.Event()
+        
+        # Note-off scheduler: one thread draining a heap of (deadline, node_id),
+        # started by the first schedule_stop() (self-ending synths never need it)
+        self._sched_heap = []
+        self._sched_cv = threading.Condition()
+        self._sched_running = True
+        self._sched_thread = None
         
         logger.info("🎛️ Initializing SuperCollider Engine")
     
@@ -40,8 +236,11 @@ class SuperColliderEngine:
         """Start SuperCollider server"""
         try:
             # Check if server is already running
-            self.osc_client.send_message("/status", 1)
-            time.sleep(0.1)
+            if not self.check_status():
+                raise RuntimeError("Supernova not responding on port 57110")
+            
+            # Ask for /n_end so server-freed nodes leave synth_nodes
+            self._receiver.sendto(self._encode("/notify", 1))
             
             # Load synthdefs
             await self.load_synthdefs()
@@ -53,6 +252,51 @@ class SuperColliderEngine:
             logger.warning(f"Could not start SuperCollider: {e}")
             self.is_running = False
     
+    @staticmethod
+    def _encode(address: str, *args) -> bytes:
+        """Encode a small control message"""
+        msg = osc_message_builder.OscMessageBuilder(address=address)
+        for arg in args:
+            msg.add_arg(arg)
+        return msg.build().dgram
+    
+    def _ensure_receiver(self):
+        """Start the receiver for replies from scsynth/supernova"""
+        if self._receiver is not None:
+            return
+        
+        self._receiver = FastOscReceiver()
+        self._receiver.map("/status.reply", lambda mv, n: self._status_event.set())
+        self._receiver.map("/n_end", self._on_node_end)
+        self._receiver.start()
+    
+    def _on_node_end(self, mv: memoryview, n: int):
+        """/n_end ,iiiii - first argument is the node ID (address 8 + tags 8 bytes)"""
+        if n >= 20:
+            self.synth_nodes.pop(struct.unpack_from(">i", mv, 16)[0], None)
+    
+    def check_status(self, timeout: float = STATUS_TIMEOUT) -> bool:
+        """
+        Ping the server with /status and wait for /status.reply.
+        
+        Args:
+            timeout: Seconds to wait for the reply
+            
+        Returns:
+            True if the server answered in time
+        """
+        self._ensure_receiver()
+        self._status_event.clear()
+        
+        # Replies go to the sender's address, so send from the reply socket
+        try:
+            self._receiver.sendto(self._encode("/status", 1))
+        except OSError as e:
+            logger.debug(f"/status send failed: {e}")
+            return False
+        
+        return self._status_event.wait(timeout)
+    
     async def load_synthdefs(self):
         """Load synthesizer definitions"""
         # Define basic synthesizers using OSC commands
@@ -137,9 +381,9 @@ class SuperColliderEngine:
         """Define bass synthesizer"""
         synthdef_code = """
         SynthDef(\\bass, {
-            |out=0, freq=100, amp=0.3, pan=0, gate=1|
+            |out=0, freq=100, amp=0.3, pan=0, sustain=0.5|
             var sig, env, filter;
-            env = EnvGen.kr(Env.adsr(0.01, 0.1, 0.7, 0.2), gate, doneAction:2);
+            env = EnvGen.kr(Env.linen(0.01, sustain, 0.2), doneAction:2);
             sig = Saw.ar(freq) + SinOsc.ar(freq/2);
             filter = MoogFF.ar(sig, freq * 4, 2.5);
             sig = filter * env * amp;
@@ -153,9 +397,9 @@ class SuperColliderEngine:
         """Define lead synthesizer"""
         synthdef_code = """
         SynthDef(\\lead, {
-            |out=0, freq=440, amp=0.2, pan=0, gate=1|
+            |out=0, freq=440, amp=0.2, pan=0, sustain=0.3|
             var sig, env, vibrato;
-            env = EnvGen.kr(Env.adsr(0.05, 0.1, 0.6, 0.3), gate, doneAction:2);
+            env = EnvGen.kr(Env.linen(0.05, sustain, 0.3), doneAction:2);
             vibrato = SinOsc.kr(5) * 3;
             sig = Pulse.ar(freq + vibrato, 0.3);
             sig = sig + SinOsc.ar(freq * 2, 0, 0.2);
@@ -184,24 +428,68 @@ class SuperColliderEngine:
         node_id = self.next_node_id
         self.next_node_id += 1
         
-        # Create synth node - build the arguments list
-        args = [synth_name, node_id, 1, 0]
-        
-        # Add parameters
-        for key, value in params.items():
-            args.extend([key, value])
+        # Known synths: patch a cached pre-encoded message
+        order = SYNTH_PARAMS.get(synth_name)
+        keys = tuple(k for k in order if k in params) if order else ()
+        if order and len(keys) == len(params):
+            template = self._s_new_templates.get((synth_name, keys))
+            if template is None:
+                template = self._s_new_templates[(synth_name, keys)] = SNewTemplate(synth_name, keys)
+            self.osc_client.send(template.encode(node_id, [params[k] for k in keys]))
+        else:
+            # Unknown synth or control - encode generically
+            args = [synth_name, node_id, 1, 0]
+            for key, value in params.items():
+                args.extend([key, value])
+            self.osc_client.send_message("/s_new", args)
         
-        # Send OSC message with proper format
-        self.osc_client.send_message("/s_new", args)
         self.synth_nodes[node_id] = synth_name
         
         return node_id
     
     def stop_note(self, node_id: int):
         """Stop a playing note"""
-        if node_id in self.synth_nodes:
+        # pop, not check-then-del: the /n_end handler may remove the node concurrently
+        if self.synth_nodes.pop(node_id, None) is not None:
             self.osc_client.send_message("/n_set", [node_id, "gate", 0])
-            del self.synth_nodes[node_id]
+    
+    def schedule_stop(self, node_id: int, delay: float):
+        """Schedule a note off after delay seconds (gated synths only)"""
+        with self._sched_cv:
+            if not self._sched_running:
+                return
+            if self._sched_thread is None:
+                self._sched_thread = threading.Thread(
+                    target=self._scheduler_loop, name="SCNoteScheduler", daemon=True
+                )
+                self._sched_thread.start()
+            heapq.heappush(self._sched_heap, (time.monotonic() + delay, node_id))
+            self._sched_cv.notify()
+    
+    def _scheduler_loop(self):
+        """Send scheduled note offs as their deadlines pass"""
+        while True:
+            with self._sched_cv:
+                while self._sched_running:
+                    now = time.monotonic()
+                    if self._sched_heap and self._sched_heap[0][0] <= now:
+                        break
+                    timeout = self._sched_heap[0][0] - now if self._sched_heap else None
+                    self._sched_cv.wait(timeout)
+                
+                if not self._sched_running:
+                    return
+                
+                due = []
+                while self._sched_heap and self._sched_heap[0][0] <= now:
+                    due.append(heapq.heappop(self._sched_heap)[1])
+            
+            # Send outside the lock so scheduling never waits on the socket
+            for node_id in due:
+                try:
+                    self.stop_note(node_id)
+                except Exception as e:
+                    logger.error(f"Error stopping note {node_id}: {e}")
     
     def play_drum(self, drum_type: str, velocity: float = 0.7):
         """Play a drum hit"""
@@ -217,22 +505,20 @@ class SuperColliderEngine:
     def play_bass(self, note: int, velocity: float = 0.5, duration: float = 0.5):
         """Play a bass note"""
         freq = self.midi_to_freq(note)
-        node_id = self.play_note("bass", freq=freq, amp=velocity)
+        node_id = self.play_note("bass", freq=freq, amp=velocity, sustain=duration)
         
-        # Schedule note off
-        if node_id:
-            threading.Timer(duration, lambda: self.stop_note(node_id)).start()
+        # Envelope length comes from sustain; the server frees the node (doneAction:2)
+        self.synth_nodes.pop(node_id, None)
         
         return node_id
     
     def play_lead(self, note: int, velocity: float = 0.4, duration: float = 0.3):
         """Play a lead note"""
         freq = self.midi_to_freq(note)
-        node_id = self.play_note("lead", freq=freq, amp=velocity)
+        node_id = self.play_note("lead", freq=freq, amp=velocity, sustain=duration)
         
-        # Schedule note off
-        if node_id:
-            threading.Timer(duration, lambda: self.stop_note(node_id)).start()
+        # Envelope length comes from sustain; the server frees the node (doneAction:2)
+        self.synth_nodes.pop(node_id, None)
         
         return node_id
     
@@ -256,10 +542,18 @@ class SuperColliderEngine:
     
     def midi_to_freq(self, midi_note: int) -> float:
         """Convert MIDI note to frequency"""
+        # Table only for whole note numbers; fractional (bent) notes use the formula
+        if 0 <= midi_note < 128 and (type(midi_note) is int or float(midi_note).is_integer()):
+            return float(MIDI_HZ[int(midi_note)])
         return 440.0 * (2.0 ** ((midi_note - 69) / 12.0))
     
     def stop(self):
         """Stop SuperCollider server"""
+        with self._sched_cv:
+            self._sched_running = False
+            self._sched_heap.clear()
+            self._sched_cv.notify()
+        
         try:
             # Free all nodes
             self.osc_client.send_message("/g_freeAll", [0])
@@ -270,6 +564,10 @@ class SuperColliderEngine:
             self.is_running = False
             logger.info("SuperCollider engine stopped")
             
+            if self._receiver is not None:
+                self._receiver.close()
+                self._receiver = None
+            
         except Exception as e:
             logger.error(f"Error stopping SuperCollider: {e}")
     
@@ -3,7 +3,6 @@
 import asyncio
 import logging
 from typing import Dict, Optional
-import yaml
 from pathlib import Path
 
 from ..controllers import MidiPedalController, AudioInputController
@@ -12,6 +11,8 @@ try:
 except ImportError:
     from ..agents.listener_agent import ListenerAgent
 from ..memory import SharedMemory
+from ..utils.yaml_cache import load_yaml_cached
+from ..utils.loop import install_fast_loop
 
 
 class InputSystem:
@@ -24,8 +25,7 @@ class InputSystem:
         self.logger = logging.getLogger(__name__)
         
         # Load configuration
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = load_yaml_cached(config_path)
         
         # Initialize components
         self.audio_input = None
@@ -35,30 +35,56 @@ class InputSystem:
         
         # System state
         self.is_running = False
+        self._loop = None  # Loop that owns the components (captured in initialize)
+        self._tasks = set()  # Strong refs to tasks started from callbacks
+        self._status_changed = asyncio.Event()  # Set when get_status() has something new
+        self._last_chord = None
+        
+        # Status snapshot reused by every get_status() poll
+        self._audio_status = {
+            'listening': False,
+            'level': 0.0,
+            'chord': None,
+            'pitch': None,
+            'latency': None
+        }
+        self._status = {
+            'running': False,
+            'audio_input': None,
+            'midi': None,
+            'listener': None
+        }
         
     async def initialize(self):
         """Initialize all components"""
         self.logger.info("Initializing Performia Input System...")
+        self._loop = asyncio.get_running_loop()
+        
+        # Resolve config sections once
+        audio_cfg = self.config['audio']
+        ai_cfg = self.config['audio_input']
+        midi_cfg = self.config['midi']
+        mem_cfg = self.config['memory']
         
         # Initialize shared memory
         self.shared_memory = SharedMemory(
-            buffer_size=self.config['memory']['buffer_size']
+            buffer_size=mem_cfg['buffer_size']
         )
         
         # Initialize audio input if enabled
-        if self.config['audio_input']['enabled']:
+        if ai_cfg['enabled']:
             self.audio_input = AudioInputController(
-                device_name=self.config['audio_input']['device'],
-                sample_rate=self.config['audio']['sample_rate'],
-                block_size=self.config['audio']['block_size'],
-                channels=self.config['audio_input']['channels']
+                device_name=ai_cfg['device'],
+                sample_rate=audio_cfg['sample_rate'],
+                block_size=audio_cfg['block_size'],
+                channels=ai_cfg['channels']
             )
             self.logger.info("Audio input controller initialized")
         
         # Initialize MIDI controller if enabled
-        if self.config['midi']['enabled']:
+        if midi_cfg['enabled']:
             self.midi_controller = MidiPedalController(
-                device_name=self.config['midi']['device']
+                device_name=midi_cfg['device']
             )
             self.logger.info("MIDI controller initialized")
         
@@ -74,9 +100,22 @@ class InputSystem:
         
         self.logger.info("Input system initialization complete")
     
+    def _schedule(self, coro):
+        """Run a coroutine on the system's loop; safe to call from any thread"""
+        self._loop.call_soon_threadsafe(self._spawn, coro)
+    
+    def _spawn(self, coro):
+        """Start a task on the loop and keep it referenced until done"""
+        task = self._loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
     async def _connect_components(self):
         """Wire up callbacks between components"""
         
+        if self.audio_input:
+            self.audio_input.register_analysis_callback(self._on_analysis)
+        
         if self.audio_input and self.listener_agent:
             # Connect audio analysis to listener agent
             self.audio_input.register_analysis_callback(
@@ -87,12 +126,12 @@ class InputSystem:
             # Connect MIDI pedal events to listener agent
             self.midi_controller.register_callback(
                 'listen_start',
-                lambda _: asyncio.create_task(self._start_listening())
+                self._on_listen_start
             )
             
             self.midi_controller.register_callback(
                 'listen_stop',
-                lambda _: asyncio.create_task(self._stop_listening())
+                self._on_listen_stop
             )
             
             self.midi_controller.register_callback(
@@ -100,6 +139,11 @@ class InputSystem:
                 self.listener_agent.on_mode_change
             )
             
+            self.midi_controller.register_callback(
+                'mode_change',
+                self._on_mode_change
+            )
+            
             self.midi_controller.register_callback(
                 'expression',
                 self.listener_agent.on_expression_pedal
@@ -110,12 +154,37 @@ class InputSystem:
                 self.listener_agent.on_tap_tempo
             )
     
+    def _on_listen_start(self, _):
+        """MIDI callback: begin listening on the system's loop"""
+        self._schedule(self._start_listening())
+    
+    def _on_listen_stop(self, _):
+        """MIDI callback: stop listening on the system's loop"""
+        self._schedule(self._stop_listening())
+    
+    async def _on_analysis(self, analysis: Dict):
+        """Analysis callback (runs on the loop): flag a status change when the chord changes"""
+        chord = analysis.get('chord')
+        if chord != self._last_chord:
+            self._last_chord = chord
+            self._status_changed.set()
+    
+    def _on_mode_change(self, _):
+        """MIDI callback: the listener's mode shows up in get_status()"""
+        self._status_changed.set()
+    
+    async def wait_for_status_change(self):
+        """Block until listening, mode or detected chord changes"""
+        await self._status_changed.wait()
+        self._status_changed.clear()
+    
     async def _start_listening(self):
         """Start audio input listening"""
         if self.audio_input:
             await self.audio_input.start_listening()
         if self.listener_agent:
             await self.listener_agent.on_listening_start()
+        self._status_changed.set()
         self.logger.info("Started listening to guitar input")
     
     async def _stop_listening(self):
@@ -124,6 +193,7 @@ class InputSystem:
             await self.audio_input.stop_listening()
         if self.listener_agent:
             await self.listener_agent.on_listening_stop()
+        self._status_changed.set()
         self.logger.info("Stopped listening to guitar input")
     
     async def start(self):
@@ -134,18 +204,13 @@ class InputSystem:
         self.logger.info("Starting input system...")
         self.is_running = True
         
-        # Start components
-        tasks = []
-        
-        if self.midi_controller:
-            tasks.append(asyncio.create_task(self.midi_controller.listen()))
-            
-        if self.listener_agent:
-            tasks.append(asyncio.create_task(self.listener_agent.run()))
-        
-        # Run all tasks
-        if tasks:
-            await asyncio.gather(*tasks)
+        # Run components; a failure in one cancels the others
+        async with asyncio.TaskGroup() as tg:
+            if self.midi_controller:
+                tg.create_task(self.midi_controller.listen())
+                
+            if self.listener_agent:
+                tg.create_task(self.listener_agent.run())
     
     async def stop(self):
         """Stop the input system"""
@@ -163,6 +228,7 @@ class InputSystem:
             self.midi_controller.close()
         
         self.is_running = False
+        self._status_changed.set()  # Let status waiters see the final state
         self.logger.info("Input system stopped")
     
     async def calibrate(self):
@@ -175,28 +241,28 @@ class InputSystem:
         return None
     
     def get_status(self) -> Dict:
-        """Get system status"""
-        status = {
-            'running': self.is_running,
-            'audio_input': None,
-            'midi': None,
-            'listener': None
-        }
+        """
+        Get system status
         
-        if self.audio_input:
-            status['audio_input'] = {
-                'listening': self.audio_input.is_listening,
-                'level': self.audio_input.get_input_level(),
-                'chord': self.audio_input.get_detected_chord(),
-                'pitch': self.audio_input.get_detected_pitch(),
-                'latency': self.audio_input.get_latency_stats()
-            }
+        The same dict is updated in place on every call; copy it to keep a snapshot.
+        """
+        status = self._status
+        status['running'] = self.is_running
         
-        if self.midi_controller:
-            status['midi'] = self.midi_controller.get_status()
+        audio_input = self.audio_input
+        if audio_input:
+            audio = self._audio_status
+            audio['listening'] = audio_input.is_listening
+            audio['level'] = audio_input.get_input_level()
+            audio['chord'] = audio_input.get_detected_chord()
+            audio['pitch'] = audio_input.get_detected_pitch()
+            audio['latency'] = audio_input.get_latency_stats()
+            status['audio_input'] = audio
+        else:
+            status['audio_input'] = None
         
-        if self.listener_agent:
-            status['listener'] = self.listener_agent.get_status()
+        status['midi'] = self.midi_controller.get_status() if self.midi_controller else None
+        status['listener'] = self.listener_agent.get_status() if self.listener_agent else None
         
         return status
 
@@ -233,4 +299,5 @@ async def test_input_system():
 
 
 if __name__ == "__main__":
+    install_fast_loop()
     asyncio.run(test_input_system())
@@ -7,7 +7,6 @@ Main entry point for the multi-agent musical performance system.
 import asyncio
 import sys
 import os
-import signal
 import logging
 from pathlib import Path
 
@@ -18,6 +17,7 @@ from src.agents.ensemble_manager import MusicalEnsembleManager
 from src.engine.supercollider import SuperColliderEngine
 from src.memory.shared_memory import SharedMusicalContext, LockFreeRingBuffer
 from src.personality.personality import load_personalities
+from src.utils.loop import install_fast_loop, install_shutdown_handlers, run_until_shutdown
 
 # Configure logging
 logging.basicConfig(
@@ -26,20 +26,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def signal_handler(signum, frame):
-    """Handle shutdown signals gracefully"""
-    logger.info("🛑 Shutting down Performia System...")
-    sys.exit(0)
-
 async def main():
     """Main entry point for the musical agent system"""
     
     logger.info("🎵 Starting Performia Musical Agent System")
     logger.info("=" * 50)
     
-    # Register signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    # SIGINT/SIGTERM set an event instead of raising SystemExit mid-coroutine
+    shutdown = install_shutdown_handlers()
+    ensemble = None
     
     try:
         # Load configuration
@@ -65,20 +60,19 @@ async def main():
             logger.info("✓ Latency monitoring enabled")
         
         # Start the performance
-        await ensemble.start_performance()
+        if await run_until_shutdown(ensemble.start_performance(), shutdown):
+            logger.info("🛑 Shutting down Performia System...")
         
     except Exception as e:
         logger.error(f"❌ Error in main: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        if ensemble is not None:
+            ensemble.stop()
 
 if __name__ == "__main__":
-    # Try to use uvloop for better performance
-    try:
-        import uvloop
-        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
-        logger.info("✓ Using uvloop for optimized performance")
-    except ImportError:
-        logger.warning("⚠ uvloop not available, using standard asyncio")
+    # Use uvloop for better performance
+    install_fast_loop()
     
     # Run the main function
     try:
@@ -7,15 +7,24 @@ A working version that demonstrates the system without complex agent dependencie
 import asyncio
 import sys
 import os
-import signal
 import logging
 import time
-import random
+import threading
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.utils.loop import install_fast_loop, install_shutdown_handlers, run_until_shutdown
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -23,25 +32,51 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+NOTE_NAMES = np.array(['C', 'D', 'E', 'F', 'G', 'A', 'B'])
+SCHEDULE_SIZE = 8192  # Power of two so the tick index wraps with a mask
+
+# PerformiaSystem._metrics slots
+METRIC_SCHED_LAG, METRIC_CPU, METRIC_LATE_WAKEUPS, METRIC_ACTIVE = range(4)
+METRICS_INTERVAL = 0.5  # seconds between refreshes
+TARGET_LATENCY_MS = 15.0  # Scheduler lag above this counts as a late wakeup
+
 class SimpleMusicalAgent:
     """Simplified musical agent for demonstration"""
     
-    def __init__(self, name, role):
+    __slots__ = ('name', 'role', '_ensemble', 'is_playing', 'last_note_time',
+                 '_rng', '_schedule', '_mask', '_i')
+    
+    def __init__(self, name, role, ensemble=None):
         self.name = name
         self.role = role
+        self._ensemble = ensemble
         self.is_playing = False
         self.last_note_time = time.time()
+        
+        # Pre-generated event schedule: one table lookup per tick
+        self._rng = np.random.default_rng()
+        self._schedule = self._rng.choice(NOTE_NAMES, size=SCHEDULE_SIZE)
+        self._mask = self._rng.random(SCHEDULE_SIZE) > 0.7
+        self._i = 0
         logger.info(f"✓ Created {role} agent: {name}")
     
     async def play(self):
         """Simulate playing music"""
         self.is_playing = True
-        while self.is_playing:
-            # Simulate musical events
-            if random.random() > 0.7:
-                note = random.choice(['C', 'D', 'E', 'F', 'G', 'A', 'B'])
-                logger.debug(f"{self.name} played {note}")
-            await asyncio.sleep(0.5)
+        wrap = SCHEDULE_SIZE - 1
+        if self._ensemble:
+            self._ensemble.agent_started()
+        try:
+            while self.is_playing:
+                # Simulate musical events
+                i = self._i & wrap
+                if self._mask[i]:
+                    logger.debug(f"{self.name} played {self._schedule[i]}")
+                self._i += 1
+                await asyncio.sleep(0.5)
+        finally:
+            if self._ensemble:
+                self._ensemble.agent_finished()
     
     def stop(self):
         self.is_playing = False
@@ -51,27 +86,41 @@ class SimpleEnsembleManager:
     
     def __init__(self, num_agents=4):
         self.agents = []
+        self._active = 0  # Agents currently inside play()
         roles = ['drums', 'bass', 'melody', 'harmony']
         
         for i in range(num_agents):
             agent = SimpleMusicalAgent(
                 name=f"Agent_{i}",
-                role=roles[i % len(roles)]
+                role=roles[i % len(roles)],
+                ensemble=self
             )
             self.agents.append(agent)
         
         logger.info(f"✓ Created ensemble with {num_agents} agents")
     
+    @property
+    def active_agents(self) -> int:
+        """Number of agents currently playing"""
+        return self._active
+    
+    def agent_started(self):
+        """Called by an agent entering play()"""
+        self._active += 1
+    
+    def agent_finished(self):
+        """Called by an agent leaving play()"""
+        self._active -= 1
+    
     async def start_performance(self):
         """Start all agents playing"""
         logger.info("🎵 Starting musical performance...")
         
-        # Create tasks for all agents
-        tasks = [agent.play() for agent in self.agents]
-        
         # Run all agents concurrently
         try:
-            await asyncio.gather(*tasks)
+            async with asyncio.TaskGroup() as tg:
+                for agent in self.agents:
+                    tg.create_task(agent.play())
         except asyncio.CancelledError:
             logger.info("Performance cancelled")
             for agent in self.agents:
@@ -82,20 +131,16 @@ class SimpleEnsembleManager:
         for agent in self.agents:
             agent.stop()
 
-def signal_handler(signum, frame):
-    """Handle shutdown signals gracefully"""
-    logger.info("🛑 Shutting down Performia System...")
-    sys.exit(0)
-
 async def main(enable_input=False, enable_all=False):
     """Main entry point for the musical agent system"""
     
     logger.info("🎵 Starting Performia Musical Agent System (Simplified)")
     logger.info("=" * 50)
     
-    # Register signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    # SIGINT/SIGTERM set an event instead of raising SystemExit mid-coroutine
+    shutdown = install_shutdown_handlers()
+    input_system = None
+    sc_engine = None
     
     try:
         # Load configuration
@@ -140,7 +185,15 @@ async def main(enable_input=False, enable_all=False):
             logger.warning(f"SuperCollider not available: {e}")
         
         # Start the performance
-        await ensemble.start_performance()
+        if await run_until_shutdown(ensemble.start_performance(), shutdown):
+            logger.info("🛑 Shutting down Performia System...")
+        
+        # Orderly stop: agents first, then input listeners, then the synth
+        ensemble.stop()
+        if input_system:
+            await input_system.stop()
+        if sc_engine:
+            sc_engine.stop()
         
     except Exception as e:
         logger.error(f"❌ Error in main: {e}", exc_info=True)
@@ -150,10 +203,16 @@ class PerformiaSystem:
     """Main system class for GUI integration"""
     
     def __init__(self, enable_input=False):
+        install_fast_loop()  # Before start_performance creates its loop
         self.ensemble = SimpleEnsembleManager()
         self.enable_input = enable_input
         self.is_running = False
         self.performance_task = None
+        
+        # scheduler_lag_ms, cpu%, late_wakeups, active_agents - written only by the metrics thread
+        self._metrics = np.zeros(4, dtype=np.float32)
+        self._metrics_stop = threading.Event()
+        self._metrics_thread = None
     
     def start_performance(self):
         """Start the performance in background"""
@@ -164,6 +223,11 @@ class PerformiaSystem:
             self.performance_task = loop.create_task(
                 self.ensemble.start_performance()
             )
+            self._metrics_stop.clear()
+            self._metrics_thread = threading.Thread(
+                target=self._update_metrics, name="PerformiaMetrics", daemon=True
+            )
+            self._metrics_thread.start()
             logger.info("Performance started")
     
     def stop(self):
@@ -173,14 +237,49 @@ class PerformiaSystem:
             self.is_running = False
             if self.performance_task:
                 self.performance_task.cancel()
+            self._metrics_stop.set()
+            if self._metrics_thread:
+                self._metrics_thread.join(timeout=1.0)
+                self._metrics_thread = None
             logger.info("Performance stopped")
     
+    def _update_metrics(self):
+        """Refresh the metrics slots in place until stopped"""
+        metrics = self._metrics
+        # CPU is this process's share (100 = one core) with or without psutil
+        proc = psutil.Process() if HAS_PSUTIL else None
+        if proc is not None:
+            proc.cpu_percent(None)  # Prime: first call has no interval to measure
+        last_wall = time.perf_counter()
+        last_cpu = time.process_time()
+        
+        while not self._metrics_stop.wait(METRICS_INTERVAL):
+            now = time.perf_counter()
+            # How late this thread woke up; not audio latency
+            lag_ms = max(0.0, (now - last_wall - METRICS_INTERVAL) * 1000.0)
+            
+            if proc is not None:
+                cpu = proc.cpu_percent(None)
+            else:
+                cpu_now = time.process_time()
+                cpu = 100.0 * (cpu_now - last_cpu) / (now - last_wall)
+                last_cpu = cpu_now
+            last_wall = now
+            
+            metrics[METRIC_SCHED_LAG] = lag_ms
+            metrics[METRIC_CPU] = cpu
+            if lag_ms > TARGET_LATENCY_MS:
+                metrics[METRIC_LATE_WAKEUPS] += 1
+            metrics[METRIC_ACTIVE] = self.ensemble.active_agents
+    
     def get_performance_metrics(self):
         """Get current performance metrics"""
+        metrics = self._metrics
         return {
-            'latency': random.uniform(5, 15),
-            'cpu_usage': random.uniform(20, 60),
-            'active_agents': len([a for a in self.ensemble.agents if a.is_playing])
+            'scheduler_lag_ms': float(metrics[METRIC_SCHED_LAG]),
+            'cpu_usage': float(metrics[METRIC_CPU]),
+            'late_wakeups': int(metrics[METRIC_LATE_WAKEUPS]),
+            'active_agents': self.ensemble.active_agents
         }
     
     def get_agent_states(self):
@@ -215,13 +314,8 @@ if __name__ == "__main__":
                        help='Enable all features')
     args = parser.parse_args()
     
-    # Try to use uvloop for better performance
-    try:
-        import uvloop
-        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
-        logger.info("✓ Using uvloop for optimized performance")
-    except ImportError:
-        logger.warning("⚠ uvloop not available, using standard asyncio")
+    # Use uvloop for better performance
+    install_fast_loop()
     
     # Run the main function
     try:
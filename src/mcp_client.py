@@ -4,22 +4,160 @@ Connects to the external Performia_MCP server for pattern recognition
 """
 
 import asyncio
+import base64
+import hashlib
+import json
+import struct
 import aiohttp
 import numpy as np
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any
-import yaml
 import os
 from pathlib import Path
 
+from src.utils.yaml_cache import load_yaml_cached
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+MSGPACK_HEADERS = {"Content-Type": "application/msgpack"}
+
+# Connection pool: keep sockets to the MCP server warm between per-frame requests
+POOL_SETTINGS = {
+    'limit': 32,
+    'limit_per_host': 16,
+    'keepalive_timeout': 300,
+    'ttl_dns_cache': 300,
+}
+
+
+def dumps(obj) -> bytes:
+    """Serialize to JSON bytes; NumPy arrays are encoded straight from their buffers"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=lambda o: o.tolist()).encode()
+
+
+def loads(data: bytes):
+    """Parse JSON bytes"""
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
+def packb(obj) -> bytes:
+    """Serialize to msgpack; NumPy values become lists/scalars"""
+    return msgpack.packb(
+        obj,
+        use_bin_type=True,
+        default=lambda o: o.tolist() if hasattr(o, 'tolist') else o
+    )
+
+
+def vector_key(vec: np.ndarray) -> int:
+    """8-byte content hash of a contiguous vector (hashes the buffer in place)"""
+    data = memoryview(vec).cast('B')
+    if HAS_XXHASH:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+def quantize_vector(vec: np.ndarray):
+    """
+    Quantize a feature vector to int8 with a per-vector scale.
+    
+    Returns:
+        Tuple of (scale, int8 array) where vec ~= q * scale
+    """
+    peak = float(np.max(np.abs(vec))) if len(vec) else 0.0
+    scale = peak / 127.0 if peak > 0 else 1.0
+    q = np.round(vec / scale).astype(np.int8)
+    return scale, q
+
+
+# Framed recognition stream: 4-byte big-endian length, then
+# header (version, kind 0=float32 / 1=int8, rows, dim), int8 scales, row data.
+# Replies are length-prefixed JSON lists with one result per row.
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct('>BBHH')
+
+VECTOR_DIM = 128  # Recognition feature length (batch buffers grow if rows differ)
+
+
+def encode_recognition_frame(batch: list, rows: np.ndarray) -> bytes:
+    """
+    Encode (audio_vector, quantized, _) rows as one length-prefixed frame
+    
+    Args:
+        batch: Pending rows
+        rows: The batch's vectors (or int8 codes) already stacked, shape (N, dim)
+    """
+    if batch[0][1] is not None:
+        kind = 1
+        scales = np.array([quantized[0] for _, quantized, _ in batch], dtype='>f4').tobytes()
+        data = rows
+    else:
+        kind = 0
+        scales = b''
+        data = rows.astype('>f4')
+    
+    body = FRAME_HEADER.pack(FRAME_VERSION, kind, data.shape[0], data.shape[1]) + scales + data.tobytes()
+    return len(body).to_bytes(4, 'big') + body
+
+
 class PerformiaMCPClient:
     """Client for connecting to the Performia MCP server"""
     
+    __slots__ = ('config', 'base_url', 'session', 'cache', '_cache_max', 'quantize', '_live_only', '_learn_msgpack',
+                 'batching', '_batch_wait', '_batch_max', '_pending', '_pending_event',
+                 '_batch_task', '_batch_buf', '_batch_qbuf', '_stream_config', '_reader', '_writer', '_stream_lock')
+    
     def __init__(self, config_path: str = "config/mcp_config.yaml"):
         """Initialize MCP client with configuration"""
         self.config = self._load_config(config_path)
         self.base_url = f"http://{self.config['mcp']['host']}:{self.config['mcp']['port']}"
         self.session = None
-        self.cache = {} if self.config['mcp']['cache']['enabled'] else None
+        cache_config = self.config['mcp']['cache']
+        self.cache = OrderedDict() if cache_config['enabled'] else None
+        self._cache_max = cache_config.get('max_entries', 4096)
+        self.quantize = self.config['mcp'].get('quantize_vectors', False)
+        # Live mode: recognition answers from the cache only, misses never hit the network
+        self._live_only = self.config['mcp'].get('live_only', False)
+        # msgpack learning uploads are opt-in: the server must implement endpoints.learning_msgpack
+        self._learn_msgpack = self.config['mcp'].get('learning', {}).get('msgpack', False)
+        if self._learn_msgpack and not HAS_MSGPACK:
+            print("learning.msgpack is set but msgpack is not installed - using JSON")
+            self._learn_msgpack = False
+        
+        # Recognition coalescing: vectors queued within max_wait_ms share one POST
+        batch_config = self.config['mcp'].get('batching', {})
+        self.batching = batch_config.get('enabled', False)
+        self._batch_wait = batch_config.get('max_wait_ms', 5) / 1000.0
+        self._batch_max = batch_config.get('max_items', 32)
+        self._pending = []  # (audio_vector, quantized (scale, q) or None, future)
+        self._pending_event = None
+        self._batch_task = None
+        self._batch_buf = None  # (max_items, dim) float32 rows, reused for every batch
+        self._batch_qbuf = None  # Same for int8 codes
+        
+        # Optional persistent framed stream for recognition (HTTP stays for the rest)
+        self._stream_config = self.config['mcp'].get('stream', {})
+        self._reader = None
+        self._writer = None
+        self._stream_lock = asyncio.Lock()
         
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from YAML file"""
@@ -27,23 +165,33 @@ class PerformiaMCPClient:
         if not config_file.exists():
             raise FileNotFoundError(f"MCP config not found: {config_path}")
         
-        with open(config_file, 'r') as f:
-            return yaml.safe_load(f)
+        return load_yaml_cached(config_file)
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
         await self.connect()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
         await self.disconnect()
-        if self.session:
-            await self.session.close()
+    
+    def _ensure_session(self):
+        """Create the pooled session on first use (needs a running loop)"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(**POOL_SETTINGS)
+            self.session = aiohttp.ClientSession(connector=connector)
     
     async def connect(self):
         """Establish connection to MCP server"""
+        self._ensure_session()
+        if self._batch_buf is None:
+            self._alloc_batch_buffers(VECTOR_DIM)
+        if self.batching and self._batch_task is None:
+            self._pending_event = asyncio.Event()
+            self._batch_task = asyncio.create_task(self._batch_worker())
+        if self._stream_config.get('enabled') and self._writer is None:
+            await self._open_stream()
         try:
             async with self.session.get(f"{self.base_url}/health") as resp:
                 if resp.status == 200:
@@ -53,10 +201,61 @@ class PerformiaMCPClient:
             print(f"Failed to connect to MCP: {e}")
             return False
     
+    def _alloc_batch_buffers(self, dim: int):
+        """Allocate the row buffers batches are stacked into"""
+        rows = max(self._batch_max, 1)
+        self._batch_buf = np.empty((rows, dim), dtype=np.float32)
+        self._batch_qbuf = np.empty((rows, dim), dtype=np.int8)
+    
+    def _stack_rows(self, batch: list) -> np.ndarray:
+        """Copy the batch's vectors (or int8 codes) into the reused buffer; returns a view"""
+        quantized = batch[0][1] is not None
+        dim = batch[0][1][1].shape[0] if quantized else batch[0][0].shape[0]
+        if (self._batch_buf is None or self._batch_buf.shape[1] != dim
+                or self._batch_buf.shape[0] < len(batch)):
+            self._alloc_batch_buffers(dim)
+        
+        out = self._batch_qbuf if quantized else self._batch_buf
+        for i, (vec, q, _) in enumerate(batch):
+            out[i] = q[1] if quantized else vec
+        return out[:len(batch)]
+    
+    async def _open_stream(self):
+        """Connect the recognition stream; recognition falls back to HTTP on failure"""
+        host = self.config['mcp']['host']
+        port = self._stream_config.get('port', self.config['mcp']['port'] + 1)
+        try:
+            self._reader, self._writer = await asyncio.open_connection(host, port)
+        except OSError as e:
+            print(f"MCP recognition stream unavailable ({e}), using HTTP")
+            self._reader = self._writer = None
+    
+    async def _close_stream(self):
+        """Drop the recognition stream"""
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+        self._reader = self._writer = None
+    
     async def disconnect(self):
-        """Close connection to MCP server"""
-        # Cleanup if needed
-        pass
+        """Close connection to MCP server (and its connection pool)"""
+        await self._close_stream()
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            try:
+                await self._batch_task
+            except asyncio.CancelledError:
+                pass
+            self._batch_task = None
+            self._resolve_batch(self._pending, [None] * len(self._pending))
+            self._pending = []
+        
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
     
     async def recognize_pattern(self, audio_vector: np.ndarray) -> Optional[Dict]:
         """
@@ -68,29 +267,156 @@ class PerformiaMCPClient:
         Returns:
             Pattern match with metadata or None
         """
-        # Check cache first if enabled
+        # Contiguous float32 vectors pass through without a copy; anything else
+        # is converted once here
+        if audio_vector.dtype != np.float32 or not audio_vector.flags['C_CONTIGUOUS']:
+            audio_vector = np.ascontiguousarray(audio_vector, dtype=np.float32)
+        
+        # int8 features: 8x smaller payload, and near-identical vectors share a key
+        if self.quantize:
+            quantized = quantize_vector(audio_vector)
+            scale, q = quantized
+            key_vector, key_scale = q, float(np.float16(scale))  # Coarse scale keeps keys stable
+        else:
+            quantized = None
+            key_vector, key_scale = audio_vector, None
+        
+        # Check cache first if enabled (LRU: hits move to the end)
+        cache_key = None
         if self.cache is not None:
-            cache_key = audio_vector.tobytes()
+            cache_key = (vector_key(key_vector), key_scale)
             if cache_key in self.cache:
+                self.cache.move_to_end(cache_key)
                 return self.cache[cache_key]
         
-        # Query MCP server
+        if self._live_only:
+            return None
+        
+        # Query MCP server (coalesced with concurrent callers when batching)
+        if self._batch_task is not None:
+            future = asyncio.get_running_loop().create_future()
+            if quantized is None:
+                audio_vector = audio_vector.copy()  # Caller's buffer may be reused before the batch is sent
+            self._pending.append((audio_vector, quantized, future))
+            self._pending_event.set()
+            result = await future
+        else:
+            results = await self._recognize_stream([(audio_vector, quantized, None)])
+            result = results[0] if results is not None else await self._recognize_one(audio_vector, quantized)
+        
+        # Cache result if enabled, evicting the least recently used
+        if result is not None and self.cache is not None:
+            self.cache[cache_key] = result
+            if len(self.cache) > self._cache_max:
+                self.cache.popitem(last=False)
+        
+        return result
+    
+    async def _recognize_stream(self, batch: list) -> Optional[List[Optional[Dict]]]:
+        """
+        Send rows over the framed stream.
+        
+        Returns:
+            One result per row, or None if the stream is not available
+        """
+        if self._writer is None:
+            return None
+        
+        frame = encode_recognition_frame(batch, self._stack_rows(batch))
+        try:
+            async with self._stream_lock:
+                self._writer.write(frame)
+                await self._writer.drain()
+                size = int.from_bytes(await self._reader.readexactly(4), 'big')
+                results = loads(await self._reader.readexactly(size))
+        except (OSError, asyncio.IncompleteReadError) as e:
+            print(f"MCP recognition stream lost ({e}), using HTTP")
+            await self._close_stream()
+            return None
+        
+        if isinstance(results, list) and len(results) == len(batch):
+            return results
+        return [None] * len(batch)
+    
+    async def _recognize_one(self, audio_vector: np.ndarray, quantized) -> Optional[Dict]:
+        """POST a single vector to the recognition endpoint"""
+        if quantized is not None:
+            scale, q = quantized
+            payload = {"scale": scale, "q": base64.b64encode(q.tobytes()).decode()}
+        else:
+            payload = {"vector": audio_vector}
+        
         endpoint = self.config['mcp']['endpoints']['recognition']
         async with self.session.post(
             f"{self.base_url}{endpoint}",
-            json={"vector": audio_vector.tolist()}
+            data=dumps(payload),
+            headers=JSON_HEADERS
         ) as resp:
             if resp.status == 200:
-                result = await resp.json()
-                
-                # Cache result if enabled
-                if self.cache is not None:
-                    self.cache[audio_vector.tobytes()] = result
-                
-                return result
+                return loads(await resp.read())
         
         return None
     
+    async def _recognize_batch(self, batch: list) -> List[Optional[Dict]]:
+        """POST a (N, 128) block of vectors and return one result per row"""
+        rows = self._stack_rows(batch)
+        if batch[0][1] is not None:
+            scales = [quantized[0] for _, quantized, _ in batch]
+            payload = {"scales": scales, "q": base64.b64encode(rows).decode()}
+        else:
+            payload = {"vectors": rows}
+        
+        endpoint = self.config['mcp']['endpoints']['recognition_batch']
+        async with self.session.post(
+            f"{self.base_url}{endpoint}",
+            data=dumps(payload),
+            headers=JSON_HEADERS
+        ) as resp:
+            if resp.status == 200:
+                results = loads(await resp.read())
+                if isinstance(results, dict):
+                    results = results.get('results', [])
+                if len(results) == len(batch):
+                    return results
+        
+        return [None] * len(batch)
+    
+    @staticmethod
+    def _resolve_batch(batch: list, results: list):
+        """Hand each waiting caller its row's result"""
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+    
+    async def _batch_worker(self):
+        """Collect queued vectors for up to max_wait_ms (or max_items) and send them together"""
+        while True:
+            await self._pending_event.wait()
+            if len(self._pending) < self._batch_max:
+                await asyncio.sleep(self._batch_wait)
+            
+            batch = self._pending[:self._batch_max]
+            del self._pending[:self._batch_max]
+            if not self._pending:
+                self._pending_event.clear()
+            
+            try:
+                results = await self._recognize_stream(batch)
+                if results is None and len(batch) == 1:
+                    results = [await self._recognize_one(batch[0][0], batch[0][1])]
+                elif results is None:
+                    results = await self._recognize_batch(batch)
+            except asyncio.CancelledError:
+                # disconnect() mid-send: this batch is no longer in _pending, release it here
+                self._resolve_batch(batch, [None] * len(batch))
+                raise
+            except Exception as e:
+                # Never leave callers waiting on a dead worker
+                print(f"MCP batch recognition failed: {e}")
+                results = [None] * len(batch)
+            
+            self._resolve_batch(batch, results)
+    
     async def learn_pattern(self, pattern_data: Dict) -> bool:
         """
         Send a new pattern to MCP for learning (Studio mode only)
@@ -105,11 +431,15 @@ class PerformiaMCPClient:
             print("Learning disabled in current mode")
             return False
         
-        endpoint = self.config['mcp']['endpoints']['learning']
-        async with self.session.post(
-            f"{self.base_url}{endpoint}",
-            json=pattern_data
-        ) as resp:
+        endpoints = self.config['mcp']['endpoints']
+        if self._learn_msgpack:
+            url = f"{self.base_url}{endpoints['learning_msgpack']}"
+            data, headers = packb(pattern_data), MSGPACK_HEADERS
+        else:
+            url = f"{self.base_url}{endpoints['learning']}"
+            data, headers = dumps(pattern_data), JSON_HEADERS
+        
+        async with self.session.post(url, data=data, headers=headers) as resp:
             return resp.status == 200
     
     async def get_song_info(self, song_id: str) -> Optional[Dict]:
@@ -125,7 +455,7 @@ class PerformiaMCPClient:
         endpoint = self.config['mcp']['endpoints']['songs']
         async with self.session.get(f"{self.base_url}{endpoint}/{song_id}") as resp:
             if resp.status == 200:
-                return await resp.json()
+                return loads(await resp.read())
         return None
     
     async def search_patterns(self, query: Dict) -> List[Dict]:
@@ -141,10 +471,11 @@ class PerformiaMCPClient:
         endpoint = self.config['mcp']['endpoints']['patterns']
         async with self.session.post(
             f"{self.base_url}{endpoint}/search",
-            json=query
+            data=dumps(query),
+            headers=JSON_HEADERS
         ) as resp:
             if resp.status == 200:
-                return await resp.json()
+                return loads(await resp.read())
         return []
     
     def get_cached_patterns(self) -> Dict:
@@ -161,7 +492,7 @@ class PerformiaMCPClient:
 _mcp_client = None
 
 async def get_mcp_client() -> PerformiaMCPClient:
-    """Get or create the global MCP client instance"""
+    """Get or create the global MCP client instance (its session stays open for reuse)"""
     global _mcp_client
     if _mcp_client is None:
         _mcp_client = PerformiaMCPClient()
@@ -181,7 +512,7 @@ async def example_usage():
         
         # Learn a new pattern (Studio mode)
         new_pattern = {
-            "vector": test_vector.tolist(),
+            "vector": test_vector,
             "name": "Jazz Lick #42",
             "style": "bebop",
             "tempo": 140
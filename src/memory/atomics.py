@@ -0,0 +1,56 @@
+"""
+Acquire/release access to 64-bit position counters in shared memory
+A writer publishes a position with store_release after filling the slots;
+readers load_acquire it before touching them
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import platform
+
+logger = logging.getLogger(__name__)
+
+# C11 memory orders as understood by libatomic
+ORDER_ACQUIRE = 2
+ORDER_RELEASE = 3
+
+# x86 never reorders a load with an older load or a store with an older store,
+# so plain aligned 64-bit accesses already have acquire/release semantics there
+STRONGLY_ORDERED = platform.machine().lower() in ('x86_64', 'amd64', 'i386', 'i686', 'x86')
+
+_atomic_load = None
+_atomic_store = None
+
+if not STRONGLY_ORDERED:
+    path = ctypes.util.find_library('atomic')
+    if path:
+        _libatomic = ctypes.CDLL(path)
+        _atomic_load = _libatomic.__atomic_load_8
+        _atomic_load.restype = ctypes.c_uint64
+        _atomic_load.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        _atomic_store = _libatomic.__atomic_store_8
+        _atomic_store.restype = None
+        _atomic_store.argtypes = [ctypes.c_void_p, ctypes.c_uint64, ctypes.c_int]
+    else:
+        logger.warning("libatomic not found - ring positions use plain loads/stores")
+
+HAS_ATOMICS = STRONGLY_ORDERED or _atomic_load is not None
+
+
+if _atomic_load is not None:
+    def load_acquire(counter: ctypes.c_uint64) -> int:
+        """Read a counter; later reads of the data it guards cannot move before it"""
+        return _atomic_load(ctypes.addressof(counter), ORDER_ACQUIRE)
+
+    def store_release(counter: ctypes.c_uint64, value: int):
+        """Write a counter; earlier writes of the data it guards cannot move after it"""
+        _atomic_store(ctypes.addressof(counter), value, ORDER_RELEASE)
+else:
+    def load_acquire(counter: ctypes.c_uint64) -> int:
+        """Read a counter; later reads of the data it guards cannot move before it"""
+        return counter.value
+
+    def store_release(counter: ctypes.c_uint64, value: int):
+        """Write a counter; earlier writes of the data it guards cannot move after it"""
+        counter.value = value
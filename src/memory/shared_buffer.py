@@ -4,15 +4,21 @@ Target: <0.1ms read/write latency for musical events
 """
 
 import mmap
+import os
 import struct
 import ctypes
+import ctypes.util
 import time
 import logging
+import numpy as np
 from enum import IntEnum
 from typing import Optional, List, Tuple
 from multiprocessing import shared_memory
 import platform
 
+from . import ring_reader
+from .atomics import load_acquire, store_release
+
 logger = logging.getLogger(__name__)
 
 class EventType(IntEnum):
@@ -37,6 +43,84 @@ class EventFlags(IntEnum):
     PATTERN_START = 1 << 4
     PATTERN_END = 1 << 5
 
+# Precompiled layouts (format strings are parsed once)
+_EVENT_STRUCT = struct.Struct('<QBBHffHHQ')  # 32-byte event record
+_HEADER = struct.Struct('<QQIIIIII')  # Control block header
+_MAGIC_VER = struct.Struct('<QQ')
+_U64 = struct.Struct('<Q')
+
+# Writer's statistics line in the control block
+STATS_DTYPE = np.dtype([
+    ('writes', '<u8'),
+    ('drops', '<u8'),
+    ('max_latency_ns', '<u8'),
+])
+
+# NumPy view of the same record
+EVENT_DTYPE = np.dtype([
+    ('timestamp', '<u8'),
+    ('agent_id', 'u1'),
+    ('event_type', 'u1'),
+    ('_pad0', '<u2'),
+    ('pitch', '<f4'),
+    ('velocity', '<f4'),
+    ('duration', '<u2'),
+    ('flags', '<u2'),
+    ('_pad1', '<u8'),
+])
+
+# Not exported by the mmap module; same values on Linux and macOS
+PROT_NONE = 0
+MAP_FIXED = 0x10
+MAP_FAILED = ctypes.c_void_p(-1).value
+
+_libc = None
+
+def _get_libc():
+    """Load libc with mmap/munmap prototypes (None if unavailable)."""
+    global _libc
+    if _libc is None:
+        path = ctypes.util.find_library('c')
+        if not path:
+            return None
+        libc = ctypes.CDLL(path, use_errno=True)
+        libc.mmap.restype = ctypes.c_void_p
+        libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int,
+                              ctypes.c_int, ctypes.c_int, ctypes.c_long]
+        libc.munmap.restype = ctypes.c_int
+        libc.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+        _libc = libc
+    return _libc
+
+def _map_mirrored(fd: int, offset: int, size: int) -> Optional[int]:
+    """
+    Map [offset, offset+size) of fd twice back-to-back ("magic ring buffer").
+    
+    Reads that run past the end of the first copy continue at the start
+    of the ring, so a batch never has to be split at the wrap point.
+    
+    Returns:
+        Base address of the 2*size region, or None if mapping failed
+    """
+    libc = _get_libc()
+    if libc is None:
+        return None
+    
+    # Reserve contiguous address space, then replace both halves with the shared pages
+    base = libc.mmap(None, 2 * size, PROT_NONE,
+                     mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS, -1, 0)
+    if base in (None, MAP_FAILED):
+        return None
+    
+    for half in (0, size):
+        addr = libc.mmap(base + half, size, mmap.PROT_READ | mmap.PROT_WRITE,
+                         mmap.MAP_SHARED | MAP_FIXED, fd, offset)
+        if addr != base + half:
+            libc.munmap(base, 2 * size)
+            return None
+    
+    return base
+
 class AudioEventBuffer:
     """
     Lock-free ring buffer for musical events.
@@ -45,24 +129,48 @@ class AudioEventBuffer:
     
     # Constants
     MAGIC = 0xDEADBEEF12345678
-    VERSION = 1
+    VERSION = 3
     EVENT_SIZE = 32  # bytes per event
-    BUFFER_SIZE = 1024 * 1024  # 1MB total
-    CONTROL_SIZE = 256  # Control block size
-    EVENT_BUFFER_SIZE = BUFFER_SIZE - CONTROL_SIZE
-    MAX_EVENTS = EVENT_BUFFER_SIZE // EVENT_SIZE  # 32,760 events
+    CONTROL_SIZE = 4096  # Control block size (one page, so the payload is mmap-able)
+    
+    # Control block layout: every hot counter owns a cache line so the writer
+    # and each reader never invalidate each other's lines
+    CACHE_LINE = 64
+    WRITE_POS_OFFSET = 64  # Writer's line: write position + sequence number
+    SEQ_NUM_OFFSET = 72
+    READ_POS_OFFSET = 128  # Reader i at READ_POS_OFFSET + i * CACHE_LINE (position, reads)
+    READS_OFFSET = 8  # Reader's event count, after its position on the same line
+    STATS_OFFSET = 512  # Writer's statistics line (STATS_DTYPE)
+    MAX_EVENTS = 32768  # Payload is exactly 1MB
+    assert MAX_EVENTS & (MAX_EVENTS - 1) == 0, "MAX_EVENTS must be a power of two"
+    INDEX_MASK = MAX_EVENTS - 1  # Positions are monotonic; slot = position & INDEX_MASK
+    EVENT_BUFFER_SIZE = MAX_EVENTS * EVENT_SIZE
+    BUFFER_SIZE = CONTROL_SIZE + EVENT_BUFFER_SIZE
     MAX_READERS = 5  # GUI, SC, and 3 monitoring slots
+    LATENCY_SAMPLE_INTERVAL = 16  # With measure_latency, time one write in this many
     
-    def __init__(self, name: str = "PerformiaBuffer", create: bool = False):
+    # Records start on a 32-byte boundary, so none straddles a cache line and
+    # each write_event touches exactly one line
+    assert CONTROL_SIZE % CACHE_LINE == 0 and CACHE_LINE % EVENT_SIZE == 0
+    assert READ_POS_OFFSET + MAX_READERS * CACHE_LINE <= STATS_OFFSET
+    assert STATS_OFFSET + CACHE_LINE <= CONTROL_SIZE
+    
+    def __init__(self, name: str = "PerformiaBuffer", create: bool = False,
+                 notify_fd: Optional[int] = None, measure_latency: bool = False):
         """
         Initialize shared memory buffer.
         
         Args:
             name: Shared memory segment name
             create: True to create new, False to attach existing
+            notify_fd: Inherited eventfd of the creator (attach only)
+            measure_latency: Time sampled write_event calls into stats['max_latency_ns']
         """
         self.name = name
         self.is_creator = create
+        self._notify_fd = notify_fd
+        self._measure_latency = measure_latency
+        self._latency_countdown = 1  # First write is sampled
         
         try:
             if create:
@@ -82,6 +190,10 @@ class AudioEventBuffer:
                 )
                 self.buffer = self.shm.buf
                 self._initialize_control_block()
+                
+                # Wakeup channel for readers (Linux only, inherited by forked children)
+                if hasattr(os, 'eventfd'):
+                    self._notify_fd = os.eventfd(0, os.EFD_NONBLOCK)
                 logger.info(f"Created shared memory buffer: {name} ({self.BUFFER_SIZE} bytes)")
             else:
                 # Attach to existing segment
@@ -93,13 +205,32 @@ class AudioEventBuffer:
             # Create atomic access to positions
             self._setup_atomic_positions()
             
-            # Statistics
-            self.stats = {
-                'writes': 0,
-                'reads': 0,
-                'drops': 0,
-                'max_latency_ns': 0
-            }
+            # Writer's last view of the slowest reader; only refreshed when the
+            # ring looks full (readers only move forward, so it is never too high)
+            self._cached_min_read = 0
+            
+            # Flat byte view of the event payload for the compiled reader
+            self._ring = np.frombuffer(
+                self.buffer, dtype=np.uint8,
+                count=self.EVENT_BUFFER_SIZE, offset=self.CONTROL_SIZE
+            )
+            
+            # Double-mapped payload: any batch is one contiguous slice
+            self._mirror_base = None
+            self._mirror = None
+            fd = getattr(self.shm, '_fd', -1)
+            if fd >= 0:
+                self._mirror_base = _map_mirrored(fd, self.CONTROL_SIZE, self.EVENT_BUFFER_SIZE)
+            if self._mirror_base is not None:
+                self._mirror = np.ctypeslib.as_array(
+                    (ctypes.c_uint8 * (2 * self.EVENT_BUFFER_SIZE)).from_address(self._mirror_base)
+                )
+            else:
+                logger.debug("Mirrored ring mapping unavailable, using wrap-aware reads")
+            
+            # Statistics live in the control block, so every attached process
+            # (and external tools, via stats_view) sees the writer's numbers
+            self._setup_stats()
             
         except Exception as e:
             logger.error(f"Failed to initialize shared memory: {e}")
@@ -107,30 +238,30 @@ class AudioEventBuffer:
     
     def _initialize_control_block(self):
         """Initialize control block with header information."""
-        # Clear buffer
-        self.buffer[:] = b'\x00' * self.BUFFER_SIZE
+        # Clear buffer in place (also faults every page in before real-time use)
+        base = ctypes.c_char.from_buffer(self.buffer)
+        ctypes.memset(ctypes.addressof(base), 0, self.BUFFER_SIZE)
+        del base  # Release the export so the segment can be closed later
         
         # Write header
-        header = struct.pack(
-            '<QQIIIIII',
+        _HEADER.pack_into(
+            self.buffer, 0,
             self.MAGIC,           # Magic number (8 bytes)
             self.VERSION,         # Version (8 bytes)
-            0,                    # Write position (4 bytes)
+            0,                    # Reserved (4 bytes)
             0,                    # Padding (4 bytes)
             self.EVENT_SIZE,      # Event size (4 bytes)
             self.MAX_EVENTS,      # Max events (4 bytes)
             self.BUFFER_SIZE,     # Buffer size (4 bytes)
-            0                     # Sequence number (4 bytes)
+            0                     # Reserved (4 bytes)
         )
-        self.buffer[0:40] = header
         
-        # Initialize read positions (5 readers x 8 bytes = 40 bytes)
-        for i in range(self.MAX_READERS):
-            self.buffer[64 + i*8:64 + (i+1)*8] = struct.pack('<Q', 0)
+        # Write position, sequence number and read positions start at zero
+        # (each on its own cache line, see READ_POS_OFFSET); the clear above set them
     
     def _verify_control_block(self):
         """Verify control block has correct magic and version."""
-        magic, version = struct.unpack('<QQ', self.buffer[0:16])
+        magic, version = _MAGIC_VER.unpack_from(self.buffer, 0)
         
         if magic != self.MAGIC:
             raise ValueError(f"Invalid magic number: 0x{magic:016X}")
@@ -143,12 +274,14 @@ class AudioEventBuffer:
         # Platform-specific atomic operations
         if platform.system() in ['Linux', 'Darwin']:  # Unix-like
             # Create ctypes pointers for atomic access
-            self.write_pos = ctypes.c_uint32.from_buffer(self.buffer, 16)
-            self.seq_num = ctypes.c_uint32.from_buffer(self.buffer, 36)
+            self.write_pos = ctypes.c_uint64.from_buffer(self.buffer, self.WRITE_POS_OFFSET)
+            self.seq_num = ctypes.c_uint32.from_buffer(self.buffer, self.SEQ_NUM_OFFSET)
             
             self.read_positions = []
             for i in range(self.MAX_READERS):
-                pos = ctypes.c_uint64.from_buffer(self.buffer, 64 + i*8)
+                pos = ctypes.c_uint64.from_buffer(
+                    self.buffer, self.READ_POS_OFFSET + i * self.CACHE_LINE
+                )
                 self.read_positions.append(pos)
         else:
             # Windows or other platforms - use struct (not truly atomic)
@@ -156,9 +289,25 @@ class AudioEventBuffer:
             self.write_pos = None
             self.read_positions = None
     
+    def _setup_stats(self):
+        """Map the statistics counters in the control block."""
+        self.stats_view = np.frombuffer(
+            self.buffer, dtype=STATS_DTYPE, count=1, offset=self.STATS_OFFSET
+        )
+        self._writes = ctypes.c_uint64.from_buffer(self.buffer, self.STATS_OFFSET)
+        self._drops = ctypes.c_uint64.from_buffer(self.buffer, self.STATS_OFFSET + 8)
+        self._max_latency_ns = ctypes.c_uint64.from_buffer(self.buffer, self.STATS_OFFSET + 16)
+        self._reads = [
+            ctypes.c_uint64.from_buffer(
+                self.buffer, self.READ_POS_OFFSET + i * self.CACHE_LINE + self.READS_OFFSET
+            )
+            for i in range(self.MAX_READERS)
+        ]
+    
     def write_event(self, agent_id: int, event_type: EventType, 
                    pitch: float = 0.0, velocity: float = 0.0,
-                   duration: int = 0, flags: int = 0) -> bool:
+                   duration: int = 0, flags: int = 0,
+                   timestamp: Optional[int] = None) -> bool:
         """
         Write musical event to buffer (lock-free).
         
@@ -169,34 +318,45 @@ class AudioEventBuffer:
             velocity: Velocity/amplitude (0.0-1.0)
             duration: Duration in milliseconds
             flags: Event flags/metadata
+            timestamp: Event time in ns since the epoch (default: now); batch
+                producers pass one reading for the whole batch
             
         Returns:
             True if successful, False if buffer full
         """
-        start_time = time.perf_counter_ns()
+        sampled = False
+        if self._measure_latency:
+            self._latency_countdown -= 1
+            if not self._latency_countdown:
+                self._latency_countdown = self.LATENCY_SAMPLE_INTERVAL
+                sampled = True
+                start_time = time.perf_counter_ns()
         
         # Get current write position (atomic read)
-        if self.write_pos:
-            write_idx = self.write_pos.value % self.MAX_EVENTS
+        if self.write_pos is not None:
+            write_pos = self.write_pos.value
+            write_idx = write_pos & self.INDEX_MASK
             
-            # Check if buffer is full
-            if self.read_positions:
-                min_read = min(rp.value for rp in self.read_positions)
-                if self.write_pos.value - min_read >= self.MAX_EVENTS - 1:
-                    self.stats['drops'] += 1
-                    logger.warning("Buffer full, dropping event")
+            # Check if buffer is full (rescan the readers only when it looks full)
+            if write_pos - self._cached_min_read >= self.MAX_EVENTS - 1 and self.read_positions:
+                self._cached_min_read = min(load_acquire(rp) for rp in self.read_positions)
+                if write_pos - self._cached_min_read >= self.MAX_EVENTS - 1:
+                    # Caller decides how to report the drop (no logging on the hot path)
+                    self._drops.value += 1
                     return False
         else:
             # Fallback for non-atomic platforms
-            write_idx = struct.unpack('<I', self.buffer[16:20])[0] % self.MAX_EVENTS
+            write_pos = _U64.unpack_from(self.buffer, self.WRITE_POS_OFFSET)[0]
+            write_idx = write_pos & self.INDEX_MASK
         
         # Calculate byte offset (skip control block)
         offset = self.CONTROL_SIZE + (write_idx * self.EVENT_SIZE)
         
-        # Pack event data (32 bytes total)
-        timestamp = time.time_ns()
-        event_data = struct.pack(
-            '<QBBHffHHQ',
+        # Pack the event (32 bytes) straight into shared memory
+        if timestamp is None:
+            timestamp = time.time_ns()
+        _EVENT_STRUCT.pack_into(
+            self.buffer, offset,
             timestamp,        # 8 bytes: nanosecond timestamp
             agent_id & 0xFF,  # 1 byte: agent ID
             event_type & 0xFF,# 1 byte: event type
@@ -208,26 +368,60 @@ class AudioEventBuffer:
             0                 # 8 bytes: padding to reach 32 bytes
         )
         
-        # Write to buffer (atomic on cache-line aligned 32-byte writes)
-        for i, byte in enumerate(event_data):
-            self.buffer[offset + i] = byte
-        
         # Update write position (atomic increment)
-        if self.write_pos:
-            self.write_pos.value = (self.write_pos.value + 1) & 0xFFFFFFFF
+        # (64-bit and monotonic: never wraps in practice, so readers compare directly;
+        # release ordering makes the packed event visible before the new position)
+        if self.write_pos is not None:
+            store_release(self.write_pos, write_pos + 1)
             self.seq_num.value = (self.seq_num.value + 1) & 0xFFFFFFFF
         else:
             # Fallback
-            new_pos = (write_idx + 1) & 0xFFFFFFFF
-            self.buffer[16:20] = struct.pack('<I', new_pos)
+            _U64.pack_into(self.buffer, self.WRITE_POS_OFFSET, write_pos + 1)
         
         # Update statistics
-        self.stats['writes'] += 1
-        latency = time.perf_counter_ns() - start_time
-        self.stats['max_latency_ns'] = max(self.stats['max_latency_ns'], latency)
+        self._writes.value += 1
+        if sampled:
+            latency = time.perf_counter_ns() - start_time
+            if latency > self._max_latency_ns.value:
+                self._max_latency_ns.value = latency
         
         return True
     
+    def write_events_bulk(self, events: np.ndarray) -> int:
+        """
+        Write a batch of prepared records and publish them together.
+        
+        Args:
+            events: EVENT_DTYPE array (timestamps and all fields filled in by the caller)
+            
+        Returns:
+            Number of events written; the tail of the batch is dropped if the ring lacks room
+        """
+        if self.write_pos is None or not self.read_positions:
+            return 0
+        
+        write_pos = self.write_pos.value
+        limit = self.MAX_EVENTS - 1
+        if write_pos - self._cached_min_read + len(events) > limit:
+            self._cached_min_read = min(load_acquire(rp) for rp in self.read_positions)
+        count = max(0, min(len(events), limit - (write_pos - self._cached_min_read)))
+        self._drops.value += len(events) - count
+        if count == 0:
+            return 0
+        
+        # At most two slice copies, then one release of the new position
+        ring = self._ring.view(EVENT_DTYPE)
+        start_idx = write_pos & self.INDEX_MASK
+        first = min(count, self.MAX_EVENTS - start_idx)
+        ring[start_idx:start_idx + first] = events[:first]
+        if first < count:
+            ring[:count - first] = events[first:count]
+        
+        store_release(self.write_pos, write_pos + count)
+        self.seq_num.value = (self.seq_num.value + count) & 0xFFFFFFFF
+        self._writes.value += count
+        return count
+    
     def read_events(self, reader_id: int = 0, max_events: int = 100) -> List[Tuple]:
         """
         Read available events for a specific reader.
@@ -244,60 +438,201 @@ class AudioEventBuffer:
         
         events = []
         
-        if self.read_positions and self.write_pos:
+        if self.read_positions and self.write_pos is not None:
             read_pos = self.read_positions[reader_id]
+            start = read_pos.value
+            count = min(max_events, load_acquire(self.write_pos) - start)
+            if count <= 0:
+                return events
             
-            # Read up to write position
-            while len(events) < max_events and read_pos.value < self.write_pos.value:
-                # Calculate buffer position
-                read_idx = read_pos.value % self.MAX_EVENTS
-                offset = self.CONTROL_SIZE + (read_idx * self.EVENT_SIZE)
-                
-                # Read event data
-                event_data = bytes(self.buffer[offset:offset + self.EVENT_SIZE])
-                
-                # Unpack event (32 bytes)
-                timestamp, agent_id, event_type, _, pitch, velocity, duration, flags, _ = \
-                    struct.unpack('<QBBHffHHQ', event_data)
-                
-                events.append((timestamp, agent_id, event_type, pitch, velocity, duration, flags))
-                
-                # Update read position (atomic)
-                read_pos.value += 1
+            # At most two contiguous spans (one if the range does not wrap)
+            start_idx = start & self.INDEX_MASK
+            first = min(count, self.MAX_EVENTS - start_idx)
+            spans = [(start_idx, first)]
+            if first < count:
+                spans.append((0, count - first))
             
-            self.stats['reads'] += len(events)
+            for idx, n in spans:
+                offset = self.CONTROL_SIZE + idx * self.EVENT_SIZE
+                # Unpack straight from the shared view; the slots can't be reused
+                # until read_pos is published below
+                chunk = self.buffer[offset:offset + n * self.EVENT_SIZE]
+                events.extend(
+                    (timestamp, agent_id, event_type, pitch, velocity, duration, flags)
+                    for timestamp, agent_id, event_type, _, pitch, velocity, duration, flags, _
+                    in _EVENT_STRUCT.iter_unpack(chunk)
+                )
+            
+            # Publish the new position once for the whole batch (slots are free to reuse)
+            store_release(read_pos, start + count)
+            self._reads[reader_id].value += count
         
         return events
     
+    def read_events_array(self, reader_id: int = 0, max_events: int = 100) -> np.ndarray:
+        """
+        Read available events for a reader as a structured array.
+        
+        Args:
+            reader_id: Reader index (0-4)
+            max_events: Maximum events to read
+            
+        Returns:
+            Array of EVENT_DTYPE records (empty if nothing pending)
+        """
+        if reader_id >= self.MAX_READERS:
+            raise ValueError(f"Invalid reader_id: {reader_id} (max: {self.MAX_READERS-1})")
+        
+        pending = self.get_pending_events(reader_id)
+        events = np.empty(max(0, min(max_events, pending)), dtype=EVENT_DTYPE)
+        n = self.drain_into(reader_id, events)
+        return events[:n]
+    
+    def drain_into(self, reader_id: int, out: np.ndarray) -> int:
+        """
+        Copy pending events for a reader into a preallocated array.
+        
+        Uses the compiled ring reader when numba is available, otherwise
+        at most two contiguous NumPy slice copies. The reader position is
+        published once for the whole batch.
+        
+        Args:
+            reader_id: Reader index (0-4)
+            out: EVENT_DTYPE array to fill (its length caps the batch)
+            
+        Returns:
+            Number of events written to out
+        """
+        if reader_id >= self.MAX_READERS:
+            raise ValueError(f"Invalid reader_id: {reader_id} (max: {self.MAX_READERS-1})")
+        
+        if not self.read_positions or self.write_pos is None:
+            return 0
+        
+        read_pos = self.read_positions[reader_id]
+        start = read_pos.value
+        write = load_acquire(self.write_pos)  # Events below this are fully written
+        
+        if self._mirror is not None:
+            count = min(len(out), write - start)
+            if count <= 0:
+                return 0
+            
+            # Mirrored mapping: no wrap check, one contiguous copy
+            begin = (start & self.INDEX_MASK) * self.EVENT_SIZE
+            out.view(np.uint8)[:count * self.EVENT_SIZE] = \
+                self._mirror[begin:begin + count * self.EVENT_SIZE]
+        elif ring_reader.HAS_NUMBA:
+            count = ring_reader.drain(
+                self._ring, out.view(np.uint8), start, write, len(out)
+            )
+        else:
+            count = min(len(out), write - start)
+            if count <= 0:
+                return 0
+            
+            # Split into two spans if the range wraps around the ring
+            ring = self._ring.view(EVENT_DTYPE)
+            start_idx = start & self.INDEX_MASK
+            first = min(count, self.MAX_EVENTS - start_idx)
+            out[:first] = ring[start_idx:start_idx + first]
+            if first < count:
+                out[first:count] = ring[:count - first]
+        
+        if count:
+            store_release(read_pos, start + count)
+            self._reads[reader_id].value += count
+        
+        return count
+    
+    def get_notify_fd(self) -> Optional[int]:
+        """Get the eventfd readers can wait on, or None if unsupported."""
+        return self._notify_fd
+    
+    def notify(self):
+        """Wake readers blocked on the notify fd (call after writing a batch)."""
+        if self._notify_fd is not None:
+            try:
+                os.eventfd_write(self._notify_fd, 1)
+            except BlockingIOError:
+                pass  # Counter saturated - readers are already awake
+    
+    def clear_notify(self):
+        """Reset the notify counter before draining events."""
+        if self._notify_fd is not None:
+            try:
+                os.eventfd_read(self._notify_fd)
+            except BlockingIOError:
+                pass
+    
     def get_pending_events(self, reader_id: int = 0) -> int:
         """Get number of unread events for a reader."""
-        if self.read_positions and self.write_pos:
+        if self.read_positions and self.write_pos is not None:
             return self.write_pos.value - self.read_positions[reader_id].value
         return 0
     
-    def get_buffer_stats(self) -> dict:
-        """Get buffer statistics and health."""
-        stats = dict(self.stats)
+    def free_slots(self) -> int:
+        """
+        Number of events that can be written before the slowest reader blocks the ring.
         
-        if self.write_pos and self.read_positions:
+        Producers check this once per batch and drop stale events deliberately
+        instead of discovering a full buffer event by event.
+        """
+        if self.write_pos is None or not self.read_positions:
+            return 0
+        min_read = self._cached_min_read = min(load_acquire(rp) for rp in self.read_positions)
+        return max(0, self.MAX_EVENTS - 1 - (self.write_pos.value - min_read))
+    
+    def get_buffer_stats_into(self, stats: dict) -> dict:
+        """
+        Fill a caller-owned dict with buffer statistics and health.
+        
+        Pollers reuse one dict instead of allocating a new one per call.
+        """
+        stats['writes'] = self._writes.value
+        stats['reads'] = sum(r.value for r in self._reads)
+        stats['drops'] = self._drops.value
+        stats['max_latency_ns'] = self._max_latency_ns.value
+        
+        if self.write_pos is not None and self.read_positions:
+            write_pos = self.write_pos.value
             min_read = min(rp.value for rp in self.read_positions)
-            stats.update({
-                'write_position': self.write_pos.value,
-                'min_read_position': min_read,
-                'events_pending': self.write_pos.value - min_read,
-                'buffer_usage': (self.write_pos.value - min_read) / self.MAX_EVENTS,
-                'sequence_number': self.seq_num.value if hasattr(self, 'seq_num') else 0
-            })
+            stats['write_position'] = write_pos
+            stats['min_read_position'] = min_read
+            stats['events_pending'] = write_pos - min_read
+            stats['buffer_usage'] = (write_pos - min_read) / self.MAX_EVENTS
+            stats['sequence_number'] = self.seq_num.value
         
         return stats
     
+    def get_buffer_stats(self) -> dict:
+        """Get buffer statistics and health."""
+        return self.get_buffer_stats_into({})
+    
     def reset_reader(self, reader_id: int):
         """Reset a reader to current write position (skip all pending)."""
-        if self.read_positions and self.write_pos:
+        if self.read_positions and self.write_pos is not None:
             self.read_positions[reader_id].value = self.write_pos.value
     
+    def _release_views(self):
+        """Drop every view into the segment so it can be closed."""
+        self.buffer = None
+        self.write_pos = None
+        self.read_positions = None
+        self.seq_num = None
+        self._ring = None
+        self.stats_view = None
+        self._writes = self._drops = self._max_latency_ns = None
+        self._reads = None
+        
+        if getattr(self, '_mirror_base', None) is not None:
+            self._mirror = None
+            _get_libc().munmap(self._mirror_base, 2 * self.EVENT_BUFFER_SIZE)
+            self._mirror_base = None
+    
     def close(self):
         """Close shared memory connection."""
+        self._release_views()
         self.shm.close()
         
     def cleanup(self):
@@ -305,14 +640,15 @@ class AudioEventBuffer:
         if self.is_creator:
             try:
                 # Clear references to avoid pointer issues
-                self.buffer = None
-                self.write_pos = None
-                self.read_positions = None
-                self.seq_num = None
+                self._release_views()
                 
                 # Now safe to close and unlink
                 self.shm.close()
                 self.shm.unlink()
+                
+                if self._notify_fd is not None:
+                    os.close(self._notify_fd)
+                    self._notify_fd = None
                 logger.info(f"Cleaned up shared memory buffer: {self.name}")
             except Exception as e:
                 logger.warning(f"Error during cleanup: {e}")
@@ -325,7 +661,7 @@ def test_shared_memory():
     print("Testing shared memory buffer...")
     
     # Create buffer
-    buffer = AudioEventBuffer("PerformiaTest", create=True)
+    buffer = AudioEventBuffer("PerformiaTest", create=True, measure_latency=True)
     
     try:
         # Write test events
@@ -2,69 +2,178 @@
 Shared Memory structures for ultra-low latency inter-agent communication
 """
 
-import json
+import struct
 import time
 import multiprocessing as mp
 from multiprocessing import shared_memory
 import ctypes
 from typing import Dict, Optional
 import logging
+import numpy as np
+
+from .atomics import load_acquire, store_release
 
 logger = logging.getLogger(__name__)
 
+# Fixed 32-byte event slot: timestamp, agent index, flags, note, velocity, duration
+_SLOT = struct.Struct('<QHHfff8x')
+SLOT_SIZE = _SLOT.size
+
+# Slot flags
+HAS_NOTE = 1 << 0
+IS_CALL = 1 << 1
+
 class LockFreeRingBuffer:
-    """Lock-free ring buffer for ultra-low latency inter-agent communication"""
+    """
+    Lock-free ring buffer for ultra-low latency inter-agent communication
+    
+    Everything a reader in another process needs lives in shared state: the
+    event slots and both name tables (agent names, reader names) are in the
+    SharedMemory block, and the positions and table counts are shared ctypes
+    values. Names are append-only, so each process caches lookups locally.
+    """
+    
+    MAX_READERS = 16
+    MAX_AGENTS = 64
+    NAME_SIZE = 32  # UTF-8 bytes per interned name, NUL padded
+    
+    # Byte offsets in the shared block
+    AGENT_NAMES_OFFSET = 0
+    READER_NAMES_OFFSET = AGENT_NAMES_OFFSET + MAX_AGENTS * NAME_SIZE
+    SLOTS_OFFSET = READER_NAMES_OFFSET + MAX_READERS * NAME_SIZE
     
     def __init__(self, size: int = 1024):
         self.size = size
-        # Shared memory for musical events
+        # Shared memory for the name tables and musical events
         try:
-            self.buffer = shared_memory.SharedMemory(create=True, size=size * 256)
-            self.write_index = mp.Value(ctypes.c_uint32, 0)
-            self.read_indices = {}
+            self.buffer = shared_memory.SharedMemory(
+                create=True, size=self.SLOTS_OFFSET + size * SLOT_SIZE
+            )
+            # Single producer: published with a release store, no lock
+            self.write_index = mp.RawValue(ctypes.c_uint64, 0)
+            # One position per registered reader, indexed by slot
+            self.read_indices = mp.Array('Q', self.MAX_READERS, lock=False)
+            # Entries used in each name table; appends are serialized by the lock
+            self.agent_count = mp.RawValue(ctypes.c_uint64, 0)
+            self.reader_count = mp.RawValue(ctypes.c_uint64, 0)
+            self._names_lock = mp.Lock()
+            # Per-process caches of the shared tables
+            self._reader_slots = {}
+            self._agent_ids = {}
+            self._agent_names = {}
             logger.info(f"✓ Created lock-free ring buffer (size: {size})")
         except Exception as e:
             logger.error(f"Failed to create shared memory: {e}")
             raise
     
+    def _table_name(self, offset: int, index: int) -> str:
+        """Name stored in a shared table entry"""
+        start = offset + index * self.NAME_SIZE
+        return bytes(self.buffer.buf[start:start + self.NAME_SIZE]).rstrip(b'\0').decode('utf-8')
+    
+    def _intern(self, offset: int, count, capacity: int, name: str) -> int:
+        """Index of name in a shared table, appending it if no process has yet"""
+        encoded = name.encode('utf-8')
+        if len(encoded) > self.NAME_SIZE:
+            raise ValueError(f"Name longer than {self.NAME_SIZE} bytes: {name!r}")
+        
+        with self._names_lock:
+            n = count.value
+            for index in range(n):
+                if self._table_name(offset, index) == name:
+                    return index
+            if n >= capacity:
+                raise ValueError(f"Name table full (max: {capacity})")
+            
+            start = offset + n * self.NAME_SIZE
+            self.buffer.buf[start:start + self.NAME_SIZE] = encoded.ljust(self.NAME_SIZE, b'\0')
+            # Release: the name bytes are visible before the entry is counted
+            store_release(count, n + 1)
+            return n
+    
+    def register_reader(self, name: str) -> int:
+        """
+        Allocate a read position for a consumer.
+        
+        Args:
+            name: Reader name (registering the same name again, from any process, returns its slot)
+            
+        Returns:
+            Slot to pass to read()
+        """
+        slot = self._reader_slots.get(name)
+        if slot is None:
+            slot = self._reader_slots[name] = self._intern(
+                self.READER_NAMES_OFFSET, self.reader_count, self.MAX_READERS, name
+            )
+        return slot
+    
+    def _agent_index(self, agent_id: str) -> int:
+        """Small int for an agent name, assigned on first use by any process"""
+        index = self._agent_ids.get(agent_id)
+        if index is None:
+            index = self._agent_ids[agent_id] = self._intern(
+                self.AGENT_NAMES_OFFSET, self.agent_count, self.MAX_AGENTS, agent_id
+            )
+        return index
+    
+    def _agent_name(self, index: int) -> str:
+        """Agent name for an index read from a slot"""
+        name = self._agent_names.get(index)
+        if name is None:
+            name = self._agent_names[index] = self._table_name(self.AGENT_NAMES_OFFSET, index)
+        return name
+    
     def write(self, agent_id: str, event: dict) -> None:
-        """Write musical event to buffer (lock-free)"""
-        data = json.dumps({
-            'agent_id': agent_id,
-            'timestamp': time.perf_counter_ns(),
-            **event
-        }).encode('utf-8')[:256]
+        """
+        Write musical event to buffer (lock-free)
         
-        # Get write position atomically
-        idx = self.write_index.value % self.size
+        Only the fields agents consume are kept: note, velocity, duration and is_call.
+        """
+        note = event.get('note')
+        flags = (HAS_NOTE if note is not None else 0) | (IS_CALL if event.get('is_call') else 0)
         
-        # Write to shared memory
-        start = idx * 256
-        self.buffer.buf[start:start + len(data)] = data
+        # Only this producer moves the write index
+        write_index = self.write_index.value
+        idx = write_index % self.size
         
-        # Atomic increment
-        with self.write_index.get_lock():
-            self.write_index.value += 1
-    
-    def read(self, agent_id: str) -> Optional[dict]:
-        """Read next event for this agent (lock-free)"""
-        if agent_id not in self.read_indices:
-            self.read_indices[agent_id] = 0
+        # Pack straight into shared memory
+        _SLOT.pack_into(
+            self.buffer.buf, self.SLOTS_OFFSET + idx * SLOT_SIZE,
+            time.perf_counter_ns(),
+            self._agent_index(agent_id),
+            flags,
+            note if note is not None else 0.0,
+            event.get('velocity', 0.0),
+            event.get('duration', 0.0)
+        )
         
-        if self.read_indices[agent_id] >= self.write_index.value:
+        # Publish the slot (release: the packed event is visible first)
+        store_release(self.write_index, write_index + 1)
+    
+    def read(self, reader: int) -> Optional[dict]:
+        """Read next event for a registered reader slot (lock-free)"""
+        read_index = self.read_indices[reader]
+        if read_index >= load_acquire(self.write_index):
             return None
         
-        idx = self.read_indices[agent_id] % self.size
-        start = idx * 256
+        idx = read_index % self.size
         
         # Read from shared memory
-        data = bytes(self.buffer.buf[start:start + 256])
-        try:
-            event = json.loads(data.decode('utf-8').rstrip('\x00'))
-            self.read_indices[agent_id] += 1
-            return event
-        except:
-            return None
+        timestamp, agent, flags, note, velocity, duration = \
+            _SLOT.unpack_from(self.buffer.buf, self.SLOTS_OFFSET + idx * SLOT_SIZE)
+        self.read_indices[reader] = read_index + 1
+        
+        event = {
+            'agent_id': self._agent_name(agent),
+            'timestamp': timestamp,
+            'velocity': velocity,
+            'duration': duration,
+            'is_call': bool(flags & IS_CALL)
+        }
+        if flags & HAS_NOTE:
+            event['note'] = note
+        return event
     
     def cleanup(self):
         """Clean up shared memory"""
@@ -76,25 +185,74 @@ class LockFreeRingBuffer:
 
 
 class SharedMusicalContext:
-    """Shared memory for real-time musical state"""
+    """
+    Shared memory for real-time musical state
+    
+    Fields live in one block grouped by who writes them and how often; each
+    group starts on its own cache line so e.g. the beat clock ticking does
+    not invalidate the lines agents read for key and harmony.
+    """
+    
+    CACHE_LINE = 64
+    MAX_AGENTS = 8
+    NOTES_PER_AGENT = 16
+    AGENT_STRIDE = 2 * CACHE_LINE  # Notes line + velocities line per agent
+    
+    # Byte offsets
+    TIMING_OFFSET = 0  # tempo, current_beat, bar_number (written every beat)
+    GLOBAL_OFFSET = 64  # key_signature, mode, dynamics
+    HARMONY_OFFSET = 128  # 13 floats
+    RHYTHM_OFFSET = 192  # 32 ints (two lines)
+    AGENTS_OFFSET = 320  # MAX_AGENTS * AGENT_STRIDE
+    SIZE = AGENTS_OFFSET + MAX_AGENTS * AGENT_STRIDE
     
     def __init__(self):
+        self.shm = shared_memory.SharedMemory(create=True, size=self.SIZE)
+        buf = self.shm.buf  # New segments are zero-filled
+        
+        # Tempo and timing
+        self.tempo = ctypes.c_float.from_buffer(buf, self.TIMING_OFFSET)
+        self.current_beat = ctypes.c_float.from_buffer(buf, self.TIMING_OFFSET + 4)
+        self.bar_number = ctypes.c_int32.from_buffer(buf, self.TIMING_OFFSET + 8)
+        
+        # Global musical parameters
+        self.key_signature = ctypes.c_int32.from_buffer(buf, self.GLOBAL_OFFSET)  # 0=C, 1=C#, etc
+        self.mode = ctypes.c_int32.from_buffer(buf, self.GLOBAL_OFFSET + 4)  # 0=major, 1=minor, etc
+        self.dynamics = ctypes.c_float.from_buffer(buf, self.GLOBAL_OFFSET + 8)  # Global dynamics 0-1
+        
         # Current harmonic context (12 semitones + root note)
-        self.harmony = mp.Array('f', 13)
+        self.harmony = (ctypes.c_float * 13).from_buffer(buf, self.HARMONY_OFFSET)
         # Current rhythm pattern (32 sixteenth notes)
-        self.rhythm = mp.Array('i', 32)
-        # Tempo and timing
-        self.tempo = mp.Value('f', 120.0)
-        self.current_beat = mp.Value('f', 0.0)
-        self.bar_number = mp.Value('i', 0)
+        self.rhythm = (ctypes.c_int32 * 32).from_buffer(buf, self.RHYTHM_OFFSET)
         
-        # Per-agent activity (up to 8 agents)
-        self.agent_notes = mp.Array('f', 8 * 16)
-        self.agent_velocities = mp.Array('f', 8 * 16)
+        # Per-agent activity, indexed [agent, slot]; each agent's rows own their lines
+        agent_shape = (self.MAX_AGENTS, self.NOTES_PER_AGENT)
+        agent_strides = (self.AGENT_STRIDE, 4)
+        self.agent_notes = np.ndarray(
+            agent_shape, dtype=np.float32, buffer=buf,
+            offset=self.AGENTS_OFFSET, strides=agent_strides
+        )
+        self.agent_velocities = np.ndarray(
+            agent_shape, dtype=np.float32, buffer=buf,
+            offset=self.AGENTS_OFFSET + self.CACHE_LINE, strides=agent_strides
+        )
         
-        # Global musical parameters
-        self.key_signature = mp.Value('i', 0)  # 0=C, 1=C#, etc
-        self.mode = mp.Value('i', 0)  # 0=major, 1=minor, etc
-        self.dynamics = mp.Value('f', 0.7)  # Global dynamics 0-1
+        self.tempo.value = 120.0
+        self.dynamics.value = 0.7
         
         logger.info("✓ Shared musical context initialized")
+    
+    def cleanup(self):
+        """Release the views and free the shared block (safe to call twice)"""
+        if self.shm is None:
+            return
+        self.tempo = self.current_beat = self.bar_number = None
+        self.key_signature = self.mode = self.dynamics = None
+        self.harmony = self.rhythm = None
+        self.agent_notes = self.agent_velocities = None
+        try:
+            self.shm.close()
+            self.shm.unlink()
+        except (BufferError, FileNotFoundError) as e:
+            logger.warning(f"Error cleaning up shared musical context: {e}")
+        self.shm = None
@@ -0,0 +1,93 @@
+"""
+Single-producer/single-consumer ring of fixed-size frames
+Lets a real-time thread hand frames to the event loop without locks or allocation
+"""
+
+import ctypes
+import numpy as np
+from typing import Optional, Tuple
+
+
+class SPSCRing:
+    """
+    Pre-allocated frame ring for exactly one producer and one consumer thread.
+
+    Indices are monotonic 64-bit counters; a slot is (index & mask). The
+    producer only advances write_pos and the consumer only advances read_pos,
+    and each index store happens after the slot access it publishes.
+    """
+
+    def __init__(self, capacity: int, frame_shape: Tuple[int, ...], dtype=np.float32):
+        """
+        Args:
+            capacity: Number of frames (must be a power of two)
+            frame_shape: Shape of one frame
+            dtype: Frame element type
+        """
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError(f"capacity must be a power of two, got {capacity}")
+
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.frames = np.zeros((capacity,) + tuple(frame_shape), dtype=dtype)
+        self.write_pos = ctypes.c_uint64(0)
+        self.read_pos = ctypes.c_uint64(0)
+
+    def __len__(self) -> int:
+        return self.write_pos.value - self.read_pos.value
+
+    # Producer side
+
+    def claim(self) -> Optional[np.ndarray]:
+        """Next free slot to fill in place, or None if the ring is full"""
+        w = self.write_pos.value
+        if w - self.read_pos.value >= self.capacity:
+            return None
+        return self.frames[w & self.mask]
+
+    def publish(self) -> bool:
+        """
+        Make the slot returned by claim() visible to the consumer.
+        
+        Returns:
+            True if this frame took the ring from empty to non-empty, i.e. a
+            consumer that found it empty needs waking. Judged after the store:
+            checking before it races with the consumer releasing the last frame.
+        """
+        self.write_pos.value += 1
+        return self.write_pos.value - self.read_pos.value == 1
+
+    def push(self, frame: np.ndarray) -> bool:
+        """Copy a frame into the ring; False if full"""
+        slot = self.claim()
+        if slot is None:
+            return False
+        slot[...] = frame
+        self.publish()
+        return True
+
+    # Consumer side
+
+    def peek(self) -> Optional[np.ndarray]:
+        """Oldest unread frame (a view, valid until advance()), or None if empty"""
+        r = self.read_pos.value
+        if r == self.write_pos.value:
+            return None
+        return self.frames[r & self.mask]
+
+    def advance(self):
+        """Release the frame returned by peek() back to the producer"""
+        self.read_pos.value += 1
+
+    def reset(self):
+        """Discard unread frames; only while neither side is running"""
+        self.read_pos.value = self.write_pos.value
+    
+    def pop(self) -> Optional[np.ndarray]:
+        """Copy out and release the oldest frame, or None if empty"""
+        frame = self.peek()
+        if frame is None:
+            return None
+        frame = frame.copy()
+        self.advance()
+        return frame
@@ -2,17 +2,36 @@
 Musical Personality system for agents
 """
 
+import functools
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Sequence, Tuple
 import logging
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# One record per personality from synthesis_params_batch
+SYNTH_PARAMS_DTYPE = np.dtype([
+    ('attack', '<f4'),
+    ('decay', '<f4'),
+    ('sustain', '<f4'),
+    ('release', '<f4'),
+    ('filter_cutoff', '<f4'),
+    ('resonance', '<f4'),
+    ('amplitude', '<f4'),
+])
+
+@dataclass(slots=True, frozen=True)
 class MusicalPersonality:
-    """Defines an agent's musical personality"""
+    """Defines an agent's musical personality (immutable; synthesis params computed once)"""
     
     # Core personality traits (0-1 scale)
     aggression: float = 0.5
@@ -30,8 +49,16 @@ class MusicalPersonality:
     call_response: bool = True
     imitation_tendency: float = 0.3
     
+    _synth_params: Dict = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, '_synth_params', self._compute_synthesis_params())
+    
     def to_synthesis_params(self) -> Dict:
         """Convert personality to synthesis parameters"""
+        return self._synth_params
+    
+    def _compute_synthesis_params(self) -> Dict:
         return {
             'attack': 0.001 + (1 - self.aggression) * 0.1,
             'decay': 0.05 + self.stability * 0.2,
@@ -42,16 +69,52 @@ class MusicalPersonality:
             'amplitude': 0.3 + self.aggression * 0.6
         }
 
-def load_personalities() -> Dict[str, MusicalPersonality]:
+def synthesis_params_batch(personalities: Sequence[MusicalPersonality]) -> np.ndarray:
+    """
+    Synthesis parameters for many personalities at once.
+    
+    Args:
+        personalities: Personalities to convert
+        
+    Returns:
+        SYNTH_PARAMS_DTYPE array, one record per personality
+    """
+    traits = np.array(
+        [(p.aggression, p.stability, p.harmonic_complexity, p.creativity) for p in personalities],
+        dtype=np.float32
+    ).reshape(-1, 4)
+    aggression, stability, complexity, creativity = traits.T
+    
+    out = np.empty(len(traits), dtype=SYNTH_PARAMS_DTYPE)
+    out['attack'] = 0.001 + (1 - aggression) * 0.1
+    out['decay'] = 0.05 + stability * 0.2
+    out['sustain'] = 0.3 + stability * 0.5
+    out['release'] = 0.1 + (1 - aggression) * 0.5
+    out['filter_cutoff'] = 200 + complexity * 5000
+    out['resonance'] = 0.5 + creativity * 3.5
+    out['amplitude'] = 0.3 + aggression * 0.6
+    return out
+
+PERSONALITIES_PATH = Path(__file__).resolve().parent.parent.parent / 'config' / 'personalities.json'
+
+@functools.lru_cache(maxsize=None)
+def _read_personalities(config_path: str) -> Dict:
+    """Parse a personalities file once per process"""
+    with open(config_path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+def load_personalities(config_path: str = None) -> Dict[str, MusicalPersonality]:
     """Load personality presets from configuration file"""
-    config_path = Path(__file__).parent.parent.parent / 'config' / 'personalities.json'
+    config_path = str(Path(config_path).resolve()) if config_path else str(PERSONALITIES_PATH)
     
     try:
-        with open(config_path, 'r') as f:
-            data = json.load(f)
+        data = _read_personalities(config_path)
         
         personalities = {}
         for name, params in data.get('personalities', {}).items():
+            params = dict(params)  # The parsed document is shared between calls
+            
             # Convert melodic_range from list to tuple if present
             if 'melodic_range' in params:
                 params['melodic_range'] = tuple(params['melodic_range'])
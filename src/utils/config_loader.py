@@ -2,20 +2,22 @@
 Configuration loader utility
 """
 
-import yaml
 from pathlib import Path
 import logging
 
+from .yaml_cache import load_yaml_cached
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent.parent.parent / 'config' / 'config.yaml'
+
 def load_config(config_path: str = None) -> dict:
-    """Load configuration from YAML file"""
+    """Load configuration from YAML file (parsed once per file version, see yaml_cache)"""
     if config_path is None:
-        config_path = Path(__file__).parent.parent.parent / 'config' / 'config.yaml'
+        config_path = DEFAULT_CONFIG_PATH
     
     try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        config = load_yaml_cached(config_path)
         logger.info(f"✓ Loaded configuration from {config_path}")
         return config
     except Exception as e:
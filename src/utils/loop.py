@@ -0,0 +1,78 @@
+"""
+Event loop setup
+"""
+
+import asyncio
+import logging
+import signal
+
+logger = logging.getLogger(__name__)
+
+_installed = None
+
+
+def install_fast_loop() -> bool:
+    """
+    Use uvloop for every event loop created after this call.
+    
+    Safe to call more than once; only the first call changes the policy.
+    
+    Returns:
+        True if uvloop is active
+    """
+    global _installed
+    if _installed is not None:
+        return _installed
+    
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("✓ Using uvloop for optimized performance")
+        _installed = True
+    except ImportError:
+        logger.warning("⚠ uvloop not available, using standard asyncio")
+        _installed = False
+    
+    return _installed
+
+
+def install_shutdown_handlers(signals=(signal.SIGINT, signal.SIGTERM)) -> asyncio.Event:
+    """
+    Route shutdown signals to an event on the running loop.
+    
+    Unlike a signal.signal handler calling sys.exit, nothing is raised inside
+    whatever coroutine happens to be running; the caller awaits the event
+    and shuts components down in order.
+    
+    Returns:
+        Event set when one of the signals arrives
+    """
+    loop = asyncio.get_running_loop()
+    shutdown = asyncio.Event()
+    for sig in signals:
+        try:
+            loop.add_signal_handler(sig, shutdown.set)
+        except NotImplementedError:
+            pass  # Windows: Ctrl+C still raises KeyboardInterrupt
+    return shutdown
+
+
+async def run_until_shutdown(coro, shutdown: asyncio.Event) -> bool:
+    """
+    Run a coroutine until it finishes or shutdown is set (then cancel it).
+    
+    Returns:
+        True if stopped by shutdown
+    """
+    task = asyncio.create_task(coro)
+    waiter = asyncio.create_task(shutdown.wait())
+    await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+    
+    if not task.done():
+        task.cancel()
+    waiter.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    return shutdown.is_set()
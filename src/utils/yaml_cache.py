@@ -0,0 +1,44 @@
+"""
+Cached YAML loading
+Parsed files are reused until their mtime or size changes
+"""
+
+import copy
+import os
+import yaml
+import logging
+
+logger = logging.getLogger(__name__)
+
+# libyaml-backed loader when PyYAML was built with it
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+_cache = {}  # path -> ((mtime_ns, size), parsed document)
+
+
+def load_yaml_cached(path) -> dict:
+    """
+    Load a YAML file, reusing the parsed result while the file is unchanged.
+    
+    Args:
+        path: Path to the YAML file
+        
+    Returns:
+        Parsed document (a private copy callers may modify)
+    """
+    path = os.fspath(path)
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    
+    entry = _cache.get(path)
+    if entry is None or entry[0] != stamp:
+        with open(path, 'rb') as f:  # Bytes go straight to the C reader, no text layer
+            entry = _cache[path] = (stamp, yaml.load(f, Loader=SafeLoader))
+        logger.debug(f"Parsed {path}")
+    
+    return copy.deepcopy(entry[1])
+
+
+def clear_yaml_cache():
+    """Forget all cached documents"""
+    _cache.clear()
@@ -92,21 +92,114 @@ def test_shared_memory():
         print("✓ LockFreeRingBuffer created")
         
         # Test write/read
+        reader = buffer.register_reader("test_agent")
         buffer.write("test_agent", {"note": 60, "velocity": 0.7})
-        event = buffer.read("test_agent")
+        event = buffer.read(reader)
         assert event is not None, "Failed to read from buffer"
         assert event['note'] == 60, "Incorrect data read from buffer"
         
+        # Names resolve across processes: a child writes as an agent this process never interned
+        import multiprocessing as mp
+        if 'fork' in mp.get_all_start_methods():
+            child = mp.get_context('fork').Process(
+                target=buffer.write, args=("remote_agent", {"note": 64, "velocity": 0.5})
+            )
+            child.start()
+            child.join()
+            event = buffer.read(reader)
+            assert event is not None and event['agent_id'] == "remote_agent", "Agent name not shared"
+            assert buffer.register_reader("test_agent") == reader, "Reader slot not stable"
+        
         print("✓ Shared memory read/write working")
         
         # Cleanup
         buffer.cleanup()
+        context.cleanup()
         
         return True
     except Exception as e:
         print(f"✗ Shared memory test failed: {e}")
         return False
 
+def test_audio_event_buffer():
+    """Test AudioEventBuffer batch reads"""
+    print("\nTesting audio event buffer...")
+    
+    import ctypes
+    import numpy as np
+    from src.memory.shared_buffer import AudioEventBuffer, EventType, EVENT_DTYPE
+    
+    buffer = AudioEventBuffer("PerformiaComponentTest", create=True)
+    try:
+        assert buffer.free_slots() == buffer.MAX_EVENTS - 1, "Empty buffer not fully free"
+        # Addresses only: a live ctypes view would keep cleanup() from closing the segment
+        addresses = [ctypes.addressof(c) for c in [buffer.write_pos] + buffer.read_positions]
+        lines = {a // buffer.CACHE_LINE for a in addresses}
+        assert len(lines) == len(addresses), "Position counters share a cache line"
+        for i in range(3):
+            assert buffer.write_event(agent_id=i, event_type=EventType.NOTE_ON,
+                                      pitch=60 + i, velocity=0.5)
+        assert buffer.free_slots() == buffer.MAX_EVENTS - 4, "Writes not reserved"
+        
+        events = buffer.read_events_array(reader_id=0, max_events=10)
+        assert len(events) == 3, "Expected 3 events"
+        assert list(events['pitch']) == [60.0, 61.0, 62.0], "Incorrect pitches read"
+        assert list(events['agent_id']) == [0, 1, 2], "Incorrect agent ids read"
+        assert len(buffer.read_events_array(reader_id=0)) == 0, "Reader not advanced"
+        
+        batch = np.zeros(2, dtype=EVENT_DTYPE)
+        batch['pitch'] = [70.0, 71.0]
+        assert buffer.write_events_bulk(batch) == 2, "Bulk write dropped events"
+        assert [e[3] for e in buffer.read_events(reader_id=0)] == [70.0, 71.0], "Bulk events not read back"
+        stats = buffer.get_buffer_stats()
+        assert stats['writes'] == 5 and stats['reads'] == 5, "Shared stats not updated"
+        assert buffer.stats_view['writes'][0] == 5, "Stats view out of sync"
+        del events
+        
+    finally:
+        buffer.cleanup()
+    
+    from multiprocessing import shared_memory
+    try:
+        shared_memory.SharedMemory(name=buffer.shm.name).close()
+        assert False, "cleanup() left the segment behind"
+    except FileNotFoundError:
+        pass
+    
+    print("✓ AudioEventBuffer batch read working")
+    return True
+
+def test_spsc_ring():
+    """Test SPSC frame ring handoff"""
+    print("\nTesting SPSC frame ring...")
+    
+    import numpy as np
+    from src.memory.spsc_ring import SPSCRing
+    
+    ring = SPSCRing(4, (8,))
+    for i in range(4):
+        assert ring.push(np.full(8, i, dtype=np.float32)), "Push failed before full"
+    assert not ring.push(np.zeros(8, dtype=np.float32)), "Push succeeded on full ring"
+    
+    assert ring.peek()[0] == 0, "Oldest frame not first"
+    ring.advance()
+    assert ring.push(np.full(8, 4, dtype=np.float32)), "Slot not released by advance"
+    assert [ring.pop()[0] for _ in range(4)] == [1, 2, 3, 4], "Frames out of order"
+    assert ring.pop() is None, "Empty ring returned a frame"
+    
+    # Stop with a frame still queued, then restart: the first publish must signal a wakeup
+    ring.push(np.zeros(8, dtype=np.float32))
+    ring.reset()
+    assert len(ring) == 0, "Reset left frames queued"
+    ring.claim()[:] = 5
+    assert ring.publish(), "First publish after reset did not report empty -> non-empty"
+    ring.claim()[:] = 6
+    assert not ring.publish(), "Publish onto a non-empty ring reported a wakeup"
+    assert [ring.pop()[0] for _ in range(2)] == [5, 6], "Frames lost across reset"
+    
+    print("✓ SPSC ring working")
+    return True
+
 def main():
     print("=" * 60)
     print("PERFORMIA SYSTEM COMPONENT TEST")
@@ -127,6 +220,12 @@ def main():
     if not test_shared_memory():
         all_passed = False
     
+    if not test_audio_event_buffer():
+        all_passed = False
+    
+    if not test_spsc_ring():
+        all_passed = False
+    
     # Summary
     print("\n" + "=" * 60)
     if all_passed:
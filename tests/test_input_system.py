@@ -5,57 +5,120 @@ Tests latency and functionality of guitar input processing
 """
 
 import asyncio
+import collections
 import time
 import numpy as np
 import logging
+import logging.handlers
+import math
+import os
+import queue
 from pathlib import Path
 import sys
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from controllers import AudioInputController, MidiPedalController
-from analysis import RealtimeAudioAnalyzer, ChordDetector
-from controllers.midi_controller import ListeningMode
+from utils.loop import install_fast_loop
 
+try:
+    import aioconsole
+    HAS_AIOCONSOLE = True
+except ImportError:
+    HAS_AIOCONSOLE = False
 
-async def test_audio_latency():
-    """Test audio input latency"""
-    print("\n" + "="*50)
-    print("AUDIO INPUT LATENCY TEST")
-    print("="*50)
+# Roots in the order ChordDetector names them
+ROOT_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+
+# Detections below this confidence are dropped before any bookkeeping
+MIN_CHORD_CONFIDENCE = 0.4
+
+# Scratch arrays shared by every run of the tests below. Tests run one at a time
+# on the loop, so each one just restarts its fill count at zero
+_CONF_BUF = np.empty(4096, dtype=np.float32)
+_TS_BUF = np.empty(4096, dtype=np.int64)
+
+logger = logging.getLogger(__name__)
+
+
+def make_audio_controller():
+    """Audio input controller with the settings every audio test uses"""
+    from controllers import AudioInputController
     
-    controller = AudioInputController(
+    return AudioInputController(
         device_name="Quantum 2626",
         sample_rate=48000,
         block_size=64
     )
+
+
+async def test_audio_latency(controller=None):
+    """
+    Test audio input latency
+    
+    Args:
+        controller: Already-listening controller to share; the test opens its own if None
+    """
+    print("\n" + "="*50)
+    print("AUDIO INPUT LATENCY TEST")
+    print("="*50)
     
-    # Measure analysis latency
-    latencies = []
+    owns_controller = controller is None
+    if owns_controller:
+        controller = make_audio_controller()
+    
+    # Measure analysis latency as running stats (Welford), updated once per sample
+    n, mean, m2 = 0, 0.0, 0.0
+    lo, hi = math.inf, -math.inf
+    
+    # The callback only queues the value; drain() does the bookkeeping on the loop
+    pending = collections.deque(maxlen=4096)
     
     def latency_callback(analysis):
         if 'latency_ms' in analysis:
-            latencies.append(analysis['latency_ms'])
+            pending.append(analysis['latency_ms'])
+    
+    def collect():
+        nonlocal n, mean, m2, lo, hi
+        while pending:
+            x = pending.popleft()
+            n += 1
+            d = x - mean
+            mean += d / n
+            m2 += d * (x - mean)
+            lo = min(lo, x)
+            hi = max(hi, x)
+    
+    async def drain():
+        while True:
+            collect()
+            await asyncio.sleep(0.005)
     
     controller.register_analysis_callback(latency_callback)
     
-    print("Starting audio input...")
-    await controller.start_listening()
+    if owns_controller:
+        print("Starting audio input...")
+        await controller.start_listening()
+    drain_task = asyncio.create_task(drain())
     
     print("Measuring latency for 5 seconds (play some notes)...")
     await asyncio.sleep(5)
     
-    await controller.stop_listening()
+    controller.unregister_analysis_callback(latency_callback)
+    if owns_controller:
+        await controller.stop_listening()
+    drain_task.cancel()
+    collect()
     
-    if latencies:
+    if n:
+        std = math.sqrt(m2 / (n - 1)) if n > 1 else 0.0
         print(f"\nLatency Statistics:")
-        print(f"  Mean: {np.mean(latencies):.2f}ms")
-        print(f"  Min:  {np.min(latencies):.2f}ms")
-        print(f"  Max:  {np.max(latencies):.2f}ms")
-        print(f"  Std:  {np.std(latencies):.2f}ms")
+        print(f"  Mean: {mean:.2f}ms")
+        print(f"  Min:  {lo:.2f}ms")
+        print(f"  Max:  {hi:.2f}ms")
+        print(f"  Std:  {std:.2f}ms")
         
-        if np.mean(latencies) < 8:
+        if mean < 8:
             print("✓ PASS: Mean latency under 8ms target")
         else:
             print("✗ FAIL: Mean latency exceeds 8ms target")
@@ -63,26 +126,56 @@ async def test_audio_latency():
         print("No audio detected - make sure to play your guitar!")
 
 
-async def test_chord_detection():
-    """Test chord detection accuracy"""
+async def test_chord_detection(controller=None, min_confidence: float = MIN_CHORD_CONFIDENCE):
+    """
+    Test chord detection accuracy
+    
+    Args:
+        controller: Already-listening controller to share; the test opens its own if None
+        min_confidence: Detections below this are ignored
+    """
     print("\n" + "="*50)
     print("CHORD DETECTION TEST")
     print("="*50)
     
-    controller = AudioInputController(
-        device_name="Quantum 2626",
-        sample_rate=48000,
-        block_size=64
-    )
+    owns_controller = controller is None
+    if owns_controller:
+        controller = make_audio_controller()
+    
+    # Every name the detector can emit (root + template), indexed for the seen-chords bitset
+    chord_vocab = [root + kind for kind in controller.chord_detector.templates for root in ROOT_NAMES]
+    chord_idx = {name: i for i, name in enumerate(chord_vocab)}
     
-    detected_chords = []
+    # Detections as parallel columns: names plus a preallocated float32 confidence array
+    chord_names = []
+    confidences = _CONF_BUF
+    seen = 0  # Bit i set once chord_vocab[i] has been detected
+    pending = collections.deque(maxlen=4096)
     
     def chord_callback(analysis):
-        if analysis.get('chord'):
-            chord = analysis['chord']
-            confidence = analysis.get('chord_confidence', 0)
-            detected_chords.append((chord, confidence))
-            print(f"  Detected: {chord} (confidence: {confidence:.2f})")
+        chord = analysis.get('chord')
+        confidence = analysis.get('chord_confidence', 0.0)
+        if not chord or confidence < min_confidence:
+            return
+        pending.append((chord, confidence))
+    
+    def collect():
+        nonlocal seen
+        while pending:
+            chord, confidence = pending.popleft()
+            i = chord_idx.get(chord)  # None for names outside the detector's vocabulary
+            if i is not None:
+                seen |= 1 << i
+            n = len(chord_names)
+            if n < confidences.size:
+                confidences[n] = confidence
+                chord_names.append(chord)
+            logger.info("Detected: %s (confidence: %.2f)", chord, confidence)
+    
+    async def drain():
+        while True:
+            collect()
+            await asyncio.sleep(0.005)
     
     controller.register_analysis_callback(chord_callback)
     
@@ -92,20 +185,27 @@ async def test_chord_detection():
         print(f"  - {chord}")
     
     print("\nStarting detection...")
-    await controller.start_listening()
+    if owns_controller:
+        await controller.start_listening()
+    drain_task = asyncio.create_task(drain())
     
     # Listen for 20 seconds
     await asyncio.sleep(20)
     
-    await controller.stop_listening()
+    controller.unregister_analysis_callback(chord_callback)
+    if owns_controller:
+        await controller.stop_listening()
+    drain_task.cancel()
+    collect()
     
-    if detected_chords:
-        print(f"\nDetected {len(detected_chords)} chord events")
-        avg_confidence = np.mean([c[1] for c in detected_chords])
+    n = len(chord_names)
+    if n:
+        print(f"\nDetected {n} chord events")
+        avg_confidence = confidences[:n].mean()
         print(f"Average confidence: {avg_confidence:.2f}")
         
         # Show unique chords detected
-        unique_chords = list(set(c[0] for c in detected_chords))
+        unique_chords = [name for i, name in enumerate(chord_vocab) if seen >> i & 1]
         print(f"Unique chords detected: {', '.join(unique_chords)}")
     else:
         print("No chords detected")
@@ -117,17 +217,28 @@ async def test_midi_pedal():
     print("MIDI PEDAL TEST")
     print("="*50)
     
+    from controllers import MidiPedalController
+    
     controller = MidiPedalController(device_name="Quantum 2626")
     
+    # (kind, value) per event; timestamps go to ts[i] as perf_counter_ns():
+    # monotonic, ns resolution, no wall-clock tick
     events = []
+    ts = _TS_BUF
+    
+    def record(kind, value):
+        n = len(events)
+        if n < ts.size:
+            ts[n] = time.perf_counter_ns()
+            events.append((kind, value))
     
     def pedal_callback(state):
-        events.append(('sustain', state, time.time()))
-        print(f"  Sustain pedal: {'ON' if state else 'OFF'}")
+        record('sustain', state)
+        logger.info("Sustain pedal: %s", 'ON' if state else 'OFF')
     
     def mode_callback(mode):
-        events.append(('mode', mode.value, time.time()))
-        print(f"  Mode changed to: {mode.value}")
+        record('mode', mode.value)
+        logger.info("Mode changed to: %s", mode.value)
     
     controller.register_callback('listen_start', pedal_callback)
     controller.register_callback('listen_stop', pedal_callback)
@@ -150,14 +261,11 @@ async def test_midi_pedal():
         
         # Check response time
         if len(events) >= 2:
-            response_times = []
-            for i in range(1, len(events)):
-                dt = (events[i][2] - events[i-1][2]) * 1000  # ms
-                if dt < 1000:  # Ignore long pauses
-                    response_times.append(dt)
+            dts = np.diff(ts[:len(events)]) * 1e-6  # ms
+            keep = dts < 1000.0  # Ignore long pauses
             
-            if response_times:
-                print(f"Average response time: {np.mean(response_times):.1f}ms")
+            if keep.any():
+                print(f"Average response time: {np.mean(dts, where=keep):.1f}ms")
 
 
 async def test_integrated_system():
@@ -184,74 +292,123 @@ async def test_integrated_system():
     print("  4. Press MODE pedal to change modes")
     print("  5. Press Ctrl+C to exit")
     
-    # Monitor status
+    # Monitor status (wakes only when listening, mode or chord changes)
+    status_line = "\r[%s] Chord: %-6s Level: %.2f"
+    
     async def status_monitor():
+        last = None
+        sys.stdout.flush()  # Status lines bypass sys.stdout; keep earlier prints ahead of them
         while True:
+            await system.wait_for_status_change()
             status = system.get_status()
-            if status['audio_input'] and status['audio_input']['listening']:
-                chord = status['audio_input'].get('chord', '--')
-                level = status['audio_input'].get('level', 0)
-                mode = status['listener'].get('mode', '--')
-                print(f"\r[{mode}] Chord: {chord:6s} Level: {level:.2f}", end='', flush=True)
-            await asyncio.sleep(0.1)
-    
+            audio = status['audio_input']
+            if audio and audio['listening']:
+                line = (status['listener'].get('mode', '--'),
+                        audio['chord'] or '--',
+                        audio['level'] or 0.0)
+                if line != last:  # Skip redundant redraws
+                    last = line
+                    os.write(1, (status_line % line).encode())
+    
+    # Ctrl+C cancels this task; leaving the group cancels the monitor before stop() runs
     try:
-        await asyncio.gather(
-            system.start(),
-            status_monitor()
-        )
-    except KeyboardInterrupt:
+        async with asyncio.TaskGroup() as tg:
+            monitor = tg.create_task(status_monitor())
+            await system.start()
+            monitor.cancel()  # Nothing left to report once the system has returned
+    finally:
         print("\n\nShutting down...")
         await system.stop()
 
 
+def start_log_listener() -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue drained by a background thread.
+    
+    Callers (including event callbacks) only enqueue the record; formatting
+    and the stream write happen on the listener thread.
+    """
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    ))
+    # Plain message formatter, or basicConfig would prefix it before the listener does
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
+
 async def main():
     """Run all tests"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
-    print("\n" + "="*60)
-    print("   PERFORMIA AUDIO INPUT SYSTEM - COMPREHENSIVE TEST")
-    print("="*60)
-    
-    tests = [
-        ("Audio Latency", test_audio_latency),
-        ("Chord Detection", test_chord_detection),
-        ("MIDI Pedal", test_midi_pedal),
-        ("Integrated System", test_integrated_system)
-    ]
-    
-    print("\nAvailable tests:")
-    for i, (name, _) in enumerate(tests, 1):
-        print(f"  {i}. {name}")
-    print(f"  {len(tests)+1}. Run all tests")
-    print("  0. Exit")
-    
-    choice = input("\nSelect test to run: ")
+    listener = start_log_listener()
     
     try:
-        choice = int(choice)
-        if choice == 0:
-            return
-        elif choice == len(tests) + 1:
-            # Run all tests
-            for name, test_func in tests:
-                print(f"\nRunning {name}...")
-                try:
-                    await test_func()
-                except Exception as e:
-                    print(f"Error in {name}: {e}")
-        elif 1 <= choice <= len(tests):
-            await tests[choice-1][1]()
+        print("\n" + "="*60)
+        print("   PERFORMIA AUDIO INPUT SYSTEM - COMPREHENSIVE TEST")
+        print("="*60)
+        # Loop scheduling latency is part of every measured response time
+        print(f"Event loop: {type(asyncio.get_running_loop()).__module__}")
+        
+        tests = [
+            ("Audio Latency", test_audio_latency),
+            ("Chord Detection", test_chord_detection),
+            ("MIDI Pedal", test_midi_pedal),
+            ("Integrated System", test_integrated_system)
+        ]
+        
+        print("\nAvailable tests:")
+        for i, (name, _) in enumerate(tests, 1):
+            print(f"  {i}. {name}")
+        print(f"  {len(tests)+1}. Run all tests")
+        print("  0. Exit")
+        
+        # Prompt without blocking the loop
+        prompt = "\nSelect test to run: "
+        if HAS_AIOCONSOLE:
+            choice = await aioconsole.ainput(prompt)
         else:
-            print("Invalid choice")
-    except ValueError:
-        print("Invalid input")
-    except KeyboardInterrupt:
-        print("\nTest interrupted")
+            choice = await asyncio.get_running_loop().run_in_executor(None, input, prompt)
+        
+        try:
+            choice = int(choice)
+            if choice == 0:
+                return
+            elif choice == len(tests) + 1:
+                # Run all tests; the audio tests share one open stream
+                shared_audio = (test_audio_latency, test_chord_detection)
+                controller = make_audio_controller()
+                await controller.start_listening()
+                try:
+                    for name, test_func in tests:
+                        print(f"\nRunning {name}...")
+                        try:
+                            if test_func in shared_audio:
+                                await test_func(controller=controller)
+                            else:
+                                # Release the device before tests that open their own
+                                await controller.stop_listening()
+                                await test_func()
+                        except Exception as e:
+                            print(f"Error in {name}: {e}")
+                finally:
+                    await controller.stop_listening()
+            elif 1 <= choice <= len(tests):
+                await tests[choice-1][1]()
+            else:
+                print("Invalid choice")
+        except ValueError:
+            print("Invalid input")
+        except KeyboardInterrupt:
+            print("\nTest interrupted")
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":
+    # uvloop (when installed) before the loop exists; the pedal response times include its scheduling
+    install_fast_loop()
     asyncio.run(main())